@@ -1,4 +1,6 @@
 import streamlit as st
+from model_provider import start_warm_up
+from static_assets import hero
 
 # Page configuration
 st.set_page_config(
@@ -89,7 +91,8 @@ st.markdown("<h2 class='subtitle'>Discover Your Ideal Career Path</h2>", unsafe_
 # Main image or illustration
 col1, col2, col3 = st.columns([1, 3, 1])
 with col2:
-    st.image("https://img.freepik.com/free-vector/career-path-concept-illustration_114360-3982.jpg", use_container_width=True)
+    # Served from static/ by this app, so the page makes no third-party requests
+    st.markdown(hero(), unsafe_allow_html=True)
 
 # Introduction
 st.markdown("""
@@ -190,4 +193,8 @@ st.markdown("""
 <div class='footer'>
     <p>© 2025 Career Advisor</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Load and warm up the prediction model in the background so the assessment page is ready.
+# Started once the page has rendered, so the model's imports never delay the first paint.
+start_warm_up()
@@ -0,0 +1,157 @@
+"""Questionnaire data shared by the Streamlit pages and the offline tools.
+
+Page scripts are re-executed on every rerun and render UI when imported, so
+anything another module needs lives here instead.
+"""
+import numpy as np
+
+# Maps predictions from the ML model to the corresponding field of interest
+Category_mapping = {
+    6: 'Database Administrator', 8: 'Hardware Engineer',
+    2: 'Application Support Engineer', 5: 'Cyber Security Specialist',
+    11: 'Networking Engineer', 13: 'Software Developer',
+    1: 'API Specialist', 12: 'Project Manager',
+    10: 'Information Security Specialist', 15: 'Technical Writer',
+    0: 'AI ML Specialist', 14: 'Software tester',
+    3: 'Business Analyst', 4: 'Customer Service Executive',
+    9: 'Helpdesk Engineer', 7: 'Graphics Designer'
+}
+
+#A list of questions to be asked on the form
+questions = [
+    "What is your level of expertise in database design, SQL, and data management principles?",
+    "How proficient are you in understanding CPU architecture, memory systems, and hardware components?",
+    "Rate your experience with implementing and managing distributed systems and parallel processing.",
+    "How skilled are you in network protocols, configuration, and troubleshooting?",
+    "Rate your ability to conduct digital investigations and recover electronic evidence.",
+    "What is your proficiency level in implementing cybersecurity measures and threat detection?",
+    "How experienced are you in developing and deploying software applications?",
+    "Rate your proficiency in writing efficient code across multiple programming languages.",
+    "How experienced are you in leading technical projects and managing development teams?",
+    "Rate your ability to explain complex technical concepts to diverse audiences.",
+    "What is your skill level in developing and implementing machine learning models?",
+    "How proficient are you in software design patterns and development methodologies?",
+    "Rate your expertise in statistical analysis and data visualization techniques.",
+    "How skilled are you in identifying and resolving complex technical issues?",
+    "What is your proficiency level in creating professional digital designs and graphics?"
+]
+
+options = ["Not Interested", "Poor", "Beginner", "Average", "Intermediate", "Excellent", "Professional"]
+
+
+#A dataset that maps the input from the form to integers which can be passed into the model
+def mapping(answer):
+    """Map questionnaire responses to numerical values"""
+    if answer == "Not Interested":
+        return 0
+    elif answer == "Poor":
+        return 1
+    elif answer == "Beginner":
+        return 2
+    elif answer == "Average":
+        return 3
+    elif answer == "Intermediate":
+        return 3
+    elif answer == "Excellent":
+        return 4
+    elif answer == "Professional":
+        return 5
+    return 0
+
+
+# Option shown for each value mapping() produces ("Average" and "Intermediate" both map to 3)
+level_names = ["Not Interested", "Poor", "Beginner", "Average", "Excellent", "Professional"]
+MAX_LEVEL = len(level_names) - 1
+
+
+# Dictionary mapping skill areas to job roles for explanation purposes
+skill_to_job_mapping = {
+    "database design, SQL, and data management": ["Database Administrator", "Business Analyst"],
+    "CPU architecture, memory systems, and hardware components": ["Hardware Engineer", "Networking Engineer"],
+    "distributed systems and parallel processing": ["AI ML Specialist", "Software Developer"],
+    "network protocols, configuration, and troubleshooting": ["Networking Engineer", "Cyber Security Specialist"],
+    "digital investigations and recover electronic evidence": ["Cyber Security Specialist", "Information Security Specialist"],
+    "cybersecurity measures and threat detection": ["Cyber Security Specialist", "Information Security Specialist"],
+    "developing and deploying software applications": ["Software Developer", "API Specialist"],
+    "writing efficient code across multiple programming languages": ["Software Developer", "AI ML Specialist"],
+    "leading technical projects and managing development teams": ["Project Manager", "Business Analyst"],
+    "explain complex technical concepts to diverse audiences": ["Technical Writer", "Business Analyst"],
+    "developing and implementing machine learning models": ["AI ML Specialist", "Software Developer"],
+    "software design patterns and development methodologies": ["Software Developer", "Project Manager"],
+    "statistical analysis and data visualization techniques": ["Business Analyst", "AI ML Specialist"],
+    "identifying and resolving complex technical issues": ["Application Support Engineer", "Helpdesk Engineer"],
+    "creating professional digital designs and graphics": ["Graphics Designer", "Technical Writer"]
+}
+
+
+# Question metadata in questions order, precomputed once so that explanations
+# are assembled from integer indices rather than by searching question text
+skill_areas = list(skill_to_job_mapping)
+skill_area_titles = [area.title() for area in skill_areas]
+_option_values = {option: mapping(option) for option in options}
+
+# Number of top-rated skills an explanation lists
+EXPLANATION_SKILLS = 3
+
+
+def top_skills(scores, k=EXPLANATION_SKILLS):
+    """Indices of the k highest non-zero scores, highest first, ties in question order"""
+    scores = np.asarray(scores, dtype=np.int64)
+    interested = np.flatnonzero(scores > 0)
+    # Unique keys: a higher score first, then the earlier question
+    keys = scores[interested] * len(scores) - interested
+    if len(interested) > k:
+        best = np.argpartition(-keys, k - 1)[:k]
+        interested, keys = interested[best], keys[best]
+    return interested[np.argsort(-keys)]
+
+
+# Function to generate explanation for prediction
+def generate_explanation(responses, predicted_role):
+    scores = np.array([_option_values.get(responses.get(q), 0) for q in questions])
+    skills = top_skills(scores)
+    
+    # If no interested skills, provide a generic explanation
+    if not len(skills):
+        return "Based on your overall pattern of responses, our model has identified this career path as potentially suitable. Consider exploring this field to see if it aligns with your interests and goals."
+    
+    explanation = "Based on your assessment, you demonstrated interest or proficiency in:"
+    for index in skills.tolist():
+        explanation += f"\n• {skill_area_titles[index]} (rated as '{responses[questions[index]]}')"
+    
+    explanation += "\n\nThese skills are particularly valuable for a " + predicted_role + "."
+    return explanation
+
+
+# Skill columns of CleanedData.csv, in the order the model expects its features
+FEATURE_COLUMNS = [
+    "Database Fundamentals", "Computer Architecture", "Distributed Computing Systems",
+    "Cyber Security", "Networking", "Software Development", "Programming Skills",
+    "Project Management", "Computer Forensics Fundamentals", "Technical Communication",
+    "AI ML", "Software Engineering", "Data Science", "Troubleshooting skills",
+    "Graphics Designing",
+]
+LABEL_COLUMN = "Role"
+
+# CleanedData.csv column that each question (in questions order) corresponds to
+question_columns = [
+    "Database Fundamentals", "Computer Architecture", "Distributed Computing Systems",
+    "Networking", "Computer Forensics Fundamentals", "Cyber Security", "Software Development",
+    "Programming Skills", "Project Management", "Technical Communication", "AI ML",
+    "Software Engineering", "Data Science", "Troubleshooting skills", "Graphics Designing",
+]
+# Position in FEATURE_COLUMNS of the column behind each question, and the reverse
+QUESTION_TO_FEATURE = [FEATURE_COLUMNS.index(column) for column in question_columns]
+FEATURE_TO_QUESTION = [question_columns.index(column) for column in FEATURE_COLUMNS]
+# What mapping() gives the model for each option index
+OPTION_LEVELS = [mapping(option) for option in options]
+
+
+def model_inputs(features):
+    """CleanedData.csv answer rows as the model input the page sends.
+
+    ``features`` holds option indices (0-6) in FEATURE_COLUMNS order; the model
+    takes the answers in questions order, mapped to 0-5 by mapping().
+    """
+    features = np.asarray(features)
+    return np.asarray(OPTION_LEVELS, dtype=features.dtype)[features[..., QUESTION_TO_FEATURE]]
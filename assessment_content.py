@@ -0,0 +1,228 @@
+"""Static text and markup of the Skills Assessment page, built once per process.
+
+The page script is re-executed on every rerun, so its stylesheet, the per-role
+texts and the HTML of every role-specific results section live here instead:
+each role's sections are rendered once at import and reused by every session.
+"""
+from assessment import Category_mapping
+
+# Stylesheet injected at the top of the page
+PAGE_CSS = """
+    <style>
+    /* Base styles */
+    .main {
+        padding: 10px;
+    }
+
+    /* Form styling - works in both dark and light modes */
+    .stForm {
+        background-color: rgba(100, 100, 100, 0.1); /* Subtle background that works in both themes */
+        padding: 15px;
+        border-radius: 10px;
+        box-shadow: 0 3px 6px rgba(0,0,0,0.15);
+        border: 1px solid rgba(150, 150, 150, 0.2); /* Subtle border for both themes */
+    }
+
+    /* Question group styling */
+    .question-group {
+        padding: 15px;
+        margin: 10px 0;
+        border-bottom: 2px solid rgba(150, 150, 150, 0.3); /* Works in both themes */
+        background-color: rgba(100, 100, 100, 0.05); /* Very subtle background */
+    }
+
+    /* Add a slight top border as well except for the first question */
+    .question-group:not(:first-child) {
+        border-top: 1px solid rgba(150, 150, 150, 0.2);
+    }
+
+    /* Make the last question's bottom border visible */
+    .question-group:last-child {
+        border-bottom: 2px solid rgba(150, 150, 150, 0.3);
+    }
+
+    /* Text colors and spacing - use !important sparingly */
+    h1 {
+        text-align: center;
+        padding-bottom: 15px;
+        font-size: calc(1.5rem + 1vw) !important;
+    }
+
+    h2 {
+        margin-bottom: 15px;
+        font-size: calc(1.2rem + 0.5vw) !important;
+    }
+
+    h5 {
+        font-size: calc(0.9rem + 0.3vw) !important;
+        margin-bottom: 5px !important;
+        font-weight: 600;
+    }
+
+    /* Radio button styling */
+    .stRadio {
+        margin-bottom: 20px;
+    }
+
+    .stRadio > label {
+        padding: 8px;
+        border-radius: 5px;
+        font-size: calc(0.8rem + 0.2vw) !important;
+        font-weight: 500;
+    }
+
+    /* Radio button styles that work in both themes */
+    .stRadio > div {
+        background-color: rgba(100, 100, 100, 0.05);
+        border-radius: 5px;
+        padding: 3px;
+    }
+
+    /* Mobile adjustments */
+    @media (max-width: 768px) {
+        .question-group {
+            padding: 12px;
+            margin-bottom: 12px;
+            border-radius: 6px;
+            border: 1px solid rgba(150, 150, 150, 0.3);
+            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
+        }
+
+        /* Make text bolder on mobile */
+        h5 {
+            font-weight: 600;
+        }
+
+        /* Make form more visible */
+        .stForm {
+            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+            border: 1px solid rgba(150, 150, 150, 0.3);
+        }
+    }
+
+    /* Error message styling */
+    .error-message {
+        color: #ff5252;
+        background-color: rgba(255, 0, 0, 0.1);
+        padding: 10px;
+        border-radius: 5px;
+        margin-top: 10px;
+        margin-bottom: 20px;
+        text-align: center;
+        font-weight: bold;
+        border: 1px solid rgba(255, 0, 0, 0.2);
+    }
+
+    /* Results page styling for boxes that work in both themes */
+    .result-box {
+        background-color: rgba(100, 100, 100, 0.05);
+        padding: 20px;
+        border-radius: 10px;
+        margin-bottom: 30px;
+        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+        border: 1px solid rgba(150, 150, 150, 0.2);
+    }
+
+    /* Highlight box for the main result */
+    .highlight-box {
+        padding: 30px;
+        border-radius: 10px;
+        text-align: center;
+        margin-bottom: 30px;
+        border: 1px solid rgba(100, 150, 200, 0.3);
+        background-color: rgba(100, 150, 200, 0.1);
+    }
+    </style>
+    """
+
+# Job descriptions for each role
+job_descriptions = {
+    'Database Administrator': "Database Administrators organize, store, and protect data using specialized software. They ensure databases operate efficiently, maintain data integrity, back up systems, and implement security measures. They also optimize database performance, troubleshoot issues, and ensure data accessibility while maintaining security protocols.",
+
+    'Hardware Engineer': "Hardware Engineers design, develop, and test computer systems and components. They create specifications for computer equipment, design hardware components like circuit boards, processors, and memory devices, and test prototypes. They also oversee manufacturing processes and collaborate with software developers to ensure compatibility.",
+
+    'Application Support Engineer': "Application Support Engineers maintain and troubleshoot software applications. They respond to user issues, implement software updates, perform regular maintenance, and collaborate with development teams to improve application performance. They also document solutions, train users, and contribute to continuous improvement initiatives.",
+
+    'Cyber Security Specialist': "Cyber Security Specialists protect computer systems and networks from threats. They implement security measures, monitor for breaches, conduct risk assessments, and develop security protocols. They also stay updated on emerging threats, respond to security incidents, and ensure compliance with security policies and regulations.",
+
+    'Networking Engineer': "Networking Engineers design, implement, and manage computer networks. They configure networking hardware like routers and switches, troubleshoot connectivity issues, implement security protocols, and optimize network performance. They also plan network upgrades, maintain documentation, and ensure network reliability and security.",
+
+    'Software Developer': "Software Developers design, code, and test software applications. They analyze user requirements, write clean and efficient code, debug programs, and implement software updates. They also collaborate with other developers, document code, and stay current with programming languages and development methodologies.",
+
+    'API Specialist': "API Specialists develop and maintain Application Programming Interfaces that allow different software systems to communicate. They design API architectures, implement integration solutions, ensure data security during transfers, and document API functionalities. They also troubleshoot integration issues and optimize API performance.",
+
+    'Project Manager': "Project Managers plan, execute, and close technology projects. They define project scope, create timelines, allocate resources, and coordinate team members. They also track progress, manage risks, communicate with stakeholders, and ensure project deliverables meet requirements within time and budget constraints.",
+
+    'Information Security Specialist': "Information Security Specialists establish and enforce policies to protect digital information. They assess security risks, implement protection systems, monitor for security breaches, and respond to incidents. They also educate users about security practices, stay updated on emerging threats, and ensure regulatory compliance.",
+
+    'Technical Writer': "Technical Writers create clear documentation for technology products and services. They develop user manuals, online help systems, tutorials, and reference guides. They also collaborate with subject matter experts, organize information logically, adhere to documentation standards, and ensure materials are accessible to the target audience.",
+
+    'AI ML Specialist': "AI/ML Specialists develop algorithms and systems that enable machines to learn from data and make decisions. They design and implement machine learning models, prepare and analyze data sets, train algorithms, and evaluate model performance. They also collaborate with teams to integrate AI solutions into applications and continuously improve model accuracy.",
+
+    'Software tester': "Software Testers evaluate applications to ensure quality and identify defects. They design and execute test cases, perform various testing types (functional, regression, performance), document bugs, and verify fixes. They also develop automated test scripts, participate in quality assurance processes, and help ensure software meets requirements.",
+
+    'Business Analyst': "Business Analysts bridge the gap between IT and business needs. They gather and document requirements, analyze business processes, recommend solutions, and communicate between stakeholders and development teams. They also create functional specifications, validate deliverables against requirements, and support system implementation.",
+
+    'Customer Service Executive': "Customer Service Executives in tech support users with product issues and inquiries. They troubleshoot technical problems, provide guidance on product features, manage customer accounts, and escalate complex issues. They also gather customer feedback, maintain service records, and contribute to improving customer experience.",
+
+    'Helpdesk Engineer': "Helpdesk Engineers provide technical support to resolve user issues. They diagnose and troubleshoot hardware and software problems, perform basic repairs, set up user accounts, and provide technical guidance. They also document solutions, track support tickets, and identify recurring issues for permanent resolution.",
+
+    'Graphics Designer': "Graphics Designers in tech create visual elements for digital products and interfaces. They design user interfaces, create illustrations and icons, develop brand visual identities, and produce graphics for websites and applications. They also collaborate with product teams, incorporate user feedback, and ensure designs enhance user experience."
+}
+
+# Outlook for each role
+career_outlooks = {
+    'Database Administrator': "The demand for Database Administrators remains strong as organizations continue to collect and leverage increasing amounts of data. Growth opportunities exist in cloud database management, data security, and big data environments.",
+    'Hardware Engineer': "Hardware Engineering offers stable career prospects with growth in specialized areas like IoT devices, embedded systems, and custom computing solutions for AI applications.",
+    'Application Support Engineer': "This role continues to see steady demand as businesses rely on complex software applications. Career advancement opportunities include moving into systems architecture or specialized application management.",
+    'Cyber Security Specialist': "Cybersecurity remains one of the fastest-growing technology fields due to increasing threats and regulatory requirements. Specialists with hands-on experience are in high demand across all industries.",
+    'Networking Engineer': "With the expansion of cloud computing and remote work infrastructures, skilled Networking Engineers remain essential. Growth areas include cloud networking, software-defined networking, and wireless technologies.",
+    'Software Developer': "Software development continues to be a cornerstone of the tech industry with strong job prospects. Specialization in areas like cloud development, mobile applications, or AI integration offers additional growth opportunities.",
+    'API Specialist': "As systems become increasingly interconnected, API development and management skills are in growing demand. This role offers career paths into software architecture or specialized integration services.",
+    'Project Manager': "Technical Project Managers remain in demand as organizations need skilled professionals to oversee complex technology implementations. Certification in agile methodologies or specific industries can enhance career prospects.",
+    'Information Security Specialist': "With increasing focus on data protection and privacy regulations, Information Security Specialists enjoy excellent job prospects and competitive compensation.",
+    'Technical Writer': "As technology becomes more complex, clear documentation becomes increasingly valuable. Growth areas include API documentation, developer experience, and user experience writing.",
+    'AI ML Specialist': "This is one of the fastest-growing fields in technology, with strong demand across industries implementing AI solutions. Continuing education is important as the field evolves rapidly.",
+    'Software tester': "Quality Assurance professionals remain essential in software development. Career growth opportunities include test automation, security testing, and quality management leadership.",
+    'Business Analyst': "Business Analysts with technical expertise are valuable bridges between business needs and technology solutions. Growth paths include product management or specialized industry analysis.",
+    'Customer Service Executive': "Technical customer service roles provide stable employment with advancement opportunities in customer success management or specialized product support.",
+    'Helpdesk Engineer': "Entry-level helpdesk positions offer excellent opportunities to gain experience across multiple technologies, with clear advancement paths to specialized technical roles.",
+    'Graphics Designer': "Technical design specialists focusing on UI/UX for digital products remain in demand. Career growth opportunities include moving into UX research, product design leadership, or specialized interface design."
+}
+
+DEFAULT_DESCRIPTION = "This role involves a unique combination of technical skills."
+DEFAULT_OUTLOOK = "This field offers strong growth opportunities for professionals with your skill set."
+
+
+def _render_sections(role):
+    return {
+        "description": f"""
+        <div class="result-box">
+            <p style='font-size: 1.1rem;'>{job_descriptions.get(role, DEFAULT_DESCRIPTION)}</p>
+        </div>
+    """,
+        "outlook": f"""
+        <div class="result-box">
+            <p style='font-size: 1.1rem;'>{career_outlooks.get(role, DEFAULT_OUTLOOK)}</p>
+        </div>
+    """,
+        "next_steps": f"""
+        <div class="result-box">
+            <ul style='font-size: 1.1rem;'>
+                <li><strong>Research the role:</strong> Learn more about what {role}s do day-to-day</li>
+                <li><strong>Connect with professionals:</strong> Find people working in this field on LinkedIn or professional communities</li>
+                <li><strong>Identify skill gaps:</strong> Look for specific technologies or certifications that could strengthen your profile</li>
+                <li><strong>Look for entry points:</strong> Explore internships, junior positions, or related roles that could lead to this career</li>
+            </ul>
+        </div>
+    """,
+    }
+
+
+_role_sections = {role: _render_sections(role) for role in Category_mapping.values()}
+
+
+def role_sections(role):
+    """HTML of the description, outlook and next-steps sections for ``role``"""
+    sections = _role_sections.get(role)
+    return sections if sections is not None else _render_sections(role)
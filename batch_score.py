@@ -0,0 +1,131 @@
+"""Score a whole cohort from a CSV file without going through the Streamlit form.
+
+The input uses the column layout of CleanedData.csv (a Role column is optional
+and passed through), and rows are scored in the encoding the Streamlit page
+sends the model, so each student gets the role the app would show them. It is read and scored in fixed-size chunks, and each
+chunk is appended to the output as soon as it is ready, so memory use does
+not grow with the input size.
+
+    python batch_score.py cohort.csv scored.csv --chunksize 20000 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from assessment import Category_mapping, FEATURE_COLUMNS, model_inputs, options
+from model_provider import MODEL_BACKEND, MODEL_BACKENDS, create_provider
+from ranking import top_k
+
+PREDICTION_COLUMN = "Predicted"
+ROLE_COLUMN = "Predicted Role"
+CONFIDENCE_COLUMN = "Confidence"
+
+_worker_model = None
+
+
+def score_chunk(model, chunk, probabilities=False, runner_ups=0):
+    """Return chunk with the prediction, role name and confidence appended.
+
+    ``runner_ups`` adds the role and confidence of that many next-best matches.
+    """
+    missing = [column for column in FEATURE_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"Input is missing skill columns: {', '.join(missing)}")
+    answers = chunk[FEATURE_COLUMNS].to_numpy(dtype=np.int64)
+    if answers.size and not 0 <= answers.min() <= answers.max() < len(options):
+        raise ValueError(f"Skill columns must hold option indices 0-{len(options) - 1}")
+    X = model_inputs(answers).astype(np.float64)
+    # Answer vectors repeat heavily across a cohort, so only distinct rows are
+    # scored. One predict_proba pass gives both the label (its argmax) and the
+    # confidence.
+    unique_rows, inverse = np.unique(X, axis=0, return_inverse=True)
+    proba = model.predict_proba(unique_rows)[inverse.reshape(-1)]
+    ranked_labels, ranked_proba = top_k(proba, model.classes_, runner_ups + 1)
+    scored = chunk.copy()
+    scored[PREDICTION_COLUMN] = ranked_labels[:, 0]
+    scored[ROLE_COLUMN] = [Category_mapping.get(label, "Unknown Role") for label in ranked_labels[:, 0].tolist()]
+    scored[CONFIDENCE_COLUMN] = ranked_proba[:, 0].round(6)
+    for rank in range(1, ranked_labels.shape[1]):
+        scored[f"Match {rank + 1} Role"] = [Category_mapping.get(label, "Unknown Role")
+                                            for label in ranked_labels[:, rank].tolist()]
+        scored[f"Match {rank + 1} Confidence"] = ranked_proba[:, rank].round(6)
+    if probabilities:
+        for index, label in enumerate(np.asarray(model.classes_).tolist()):
+            scored[f"P({Category_mapping.get(label, label)})"] = proba[:, index].round(6)
+    return scored
+
+
+def _init_worker(backend):
+    global _worker_model
+    _worker_model = create_provider(backend).get()
+
+
+def _score_in_worker(chunk, probabilities, runner_ups):
+    return score_chunk(_worker_model, chunk, probabilities, runner_ups)
+
+
+def _scored_chunks(chunks, backend, workers, probabilities, runner_ups):
+    if workers <= 1:
+        model = create_provider(backend).get()
+        for chunk in chunks:
+            yield score_chunk(model, chunk, probabilities, runner_ups)
+        return
+    # Keep only a few chunks in flight so memory stays bounded, and yield them
+    # in submission order so the output matches the input row order
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(backend,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_score_in_worker, chunk, probabilities, runner_ups))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def score_file(input_path, output_path, chunksize=10000, workers=1, backend=MODEL_BACKEND,
+               probabilities=False, runner_ups=0):
+    """Stream input_path through the model into output_path; return the row count"""
+    rows = 0
+    chunks = pd.read_csv(input_path, chunksize=chunksize)
+    for index, scored in enumerate(_scored_chunks(chunks, backend, workers, probabilities, runner_ups)):
+        scored.to_csv(output_path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+        rows += len(scored)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a cohort CSV with the career prediction model")
+    parser.add_argument("input", help="CSV with the skill columns of CleanedData.csv")
+    parser.add_argument("output", help="where to write the scored CSV")
+    parser.add_argument("--chunksize", type=int, default=10000, help="rows read and scored at a time")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="score chunks on a pool of this many processes (0 = one per CPU)")
+    parser.add_argument("--backend", default=MODEL_BACKEND, choices=MODEL_BACKENDS)
+    parser.add_argument("--probabilities", action="store_true",
+                        help="add one probability column per career")
+    parser.add_argument("--runner-ups", type=int, default=0,
+                        help="add the role and confidence of this many next-best matches")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    try:
+        rows = score_file(args.input, args.output, args.chunksize, workers, args.backend, args.probabilities,
+                          args.runner_ups)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed * 60 if elapsed else float("inf")
+    print(f"Scored {rows} rows in {elapsed:.1f}s ({rate:,.0f} rows/min) -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
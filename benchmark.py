@@ -0,0 +1,204 @@
+"""Reproducible benchmarks for the app's hot paths.
+
+Measures loading EnsembleModel.sav, single-row and batched predictions on rows
+sampled from CleanedData.csv, generate_explanation, and complete headless runs
+of the Skills Assessment page (first render and a form submit) through
+Streamlit's AppTest. Results are written as JSON so runs from different
+commits can be compared.
+
+    python benchmark.py run                       # writes benchmarks/<commit>.json
+    python benchmark.py compare old.json new.json # flags slowdowns beyond --threshold
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from assessment import generate_explanation, options, questions
+from model_provider import MODEL_PATH, NUMPY_MODEL_PATH
+from prediction_cache import shared_cache
+from what_if import shared_what_if_cache
+from service_loadgen import percentile, sample_answers
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGE_PATH = os.path.join(BASE_DIR, "pages", "Skills_Assessment.py")
+RESULTS_DIR = os.path.join(BASE_DIR, "benchmarks")
+
+
+def measure(func, repeats, warmup=1):
+    """Run func repeatedly and summarize the wall-clock times in milliseconds"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeats": repeats,
+        "min_ms": min(samples),
+        "median_ms": statistics.median(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p95_ms": percentile(samples, 95),
+        "max_ms": max(samples),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_load(repeats):
+    import joblib
+    return {"joblib_load": measure(lambda: joblib.load(MODEL_PATH), repeats, warmup=0)}
+
+
+def bench_predict(model, rows, repeats, prefix="predict"):
+    import numpy as np
+    X = np.asarray(rows, dtype=np.float64)
+    singles = itertools.count()
+    results = {
+        f"{prefix}_single": measure(lambda: model.predict(X[next(singles) % len(X)][np.newaxis, :]), repeats),
+    }
+    for size in (64, 1024):
+        batch = X[:size]
+        stats = measure(lambda: model.predict(batch), max(3, repeats // 10))
+        stats["rows_per_second"] = size / (stats["median_ms"] / 1000)
+        results[f"{prefix}_batch_{size}"] = stats
+    return results
+
+
+def bench_explanation(repeats, seed=0):
+    rng = random.Random(seed)
+    samples = [{q: rng.choice(options) for q in questions} for _ in range(256)]
+    items = itertools.count()
+    return {"generate_explanation": measure(
+        lambda: generate_explanation(samples[next(items) % len(samples)], "Software Developer"), repeats)}
+
+
+def bench_what_if(model, rows, repeats, prefix="what_if"):
+    from what_if import analyse
+    items = itertools.count()
+    return {f"{prefix}_analyse": measure(lambda: analyse(model, rows[next(items) % len(rows)]), repeats)}
+
+
+def bench_page(repeats):
+    from streamlit.testing.v1 import AppTest
+
+    # Read when the page first imports them; synthetic submits must not be logged or
+    # counted in the cohort analytics
+    os.environ.update(CAREER_SUBMISSION_LOG="off", CAREER_ANALYTICS_PERSIST="0")
+
+    def first_render():
+        at = AppTest.from_file(PAGE_PATH, default_timeout=60).run()
+        if at.exception:
+            raise RuntimeError(f"Page raised: {at.exception}")
+        return at
+
+    def submit():
+        # Start from empty caches so every submit runs the model
+        shared_cache.clear()
+        shared_what_if_cache.clear()
+        at = first_render()
+        for i, radio in enumerate(at.radio):
+            radio.set_value(options[(i % (len(options) - 1)) + 1])
+        next(b for b in at.button if b.label.startswith("See My Results")).click().run()
+        if at.exception or not at.session_state["show_results"]:
+            raise RuntimeError(f"Submit failed: {at.exception}")
+
+    return {
+        "page_first_render": measure(first_render, repeats),
+        "page_submit": measure(submit, repeats),
+    }
+
+
+def run(args):
+    import joblib
+    import numpy as np
+
+    rows = sample_answers(count=1024, seed=args.seed)
+    results = {}
+    results.update(bench_load(args.load_repeats))
+    model = joblib.load(MODEL_PATH)
+    results.update(bench_predict(model, rows, args.repeats))
+    results.update(bench_what_if(model, rows, args.repeats // 4))
+    if os.path.exists(NUMPY_MODEL_PATH):
+        from numpy_model import NumpyEnsemble
+        numpy_engine = NumpyEnsemble.load(NUMPY_MODEL_PATH)
+        results.update(bench_predict(numpy_engine, rows, args.repeats, "numpy_predict"))
+        results.update(bench_what_if(numpy_engine, rows, args.repeats // 4, "numpy_what_if"))
+    results.update(bench_explanation(args.repeats * 10, args.seed))
+    if not args.skip_page:
+        results.update(bench_page(args.page_repeats))
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "joblib": joblib.__version__,
+        "seed": args.seed,
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    for name, stats in results.items():
+        print(f"{name:<28} median {stats['median_ms']:10.3f} ms   p95 {stats['p95_ms']:10.3f} ms")
+    print(f"Wrote {out}")
+    return 0
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    regressions = []
+    print(f"{'benchmark':<28} {baseline['commit']:>12} {candidate['commit']:>12} {'ratio':>7}")
+    for name, stats in candidate["results"].items():
+        if name not in baseline["results"]:
+            continue
+        old, new = baseline["results"][name]["median_ms"], stats["median_ms"]
+        ratio = new / old if old else float("inf")
+        flag = "  REGRESSION" if ratio > args.threshold else ""
+        print(f"{name:<28} {old:>10.3f}ms {new:>10.3f}ms {ratio:>7.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model loading, prediction, explanations and page runs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run")
+    run_parser.add_argument("--out", help="result file (default benchmarks/<commit>.json)")
+    run_parser.add_argument("--repeats", type=int, default=200)
+    run_parser.add_argument("--load-repeats", type=int, default=5)
+    run_parser.add_argument("--page-repeats", type=int, default=10)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--skip-page", action="store_true", help="skip the Streamlit AppTest runs")
+    compare_parser = sub.add_parser("compare")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=1.2,
+                                help="median slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+    return run(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
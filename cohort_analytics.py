@@ -0,0 +1,313 @@
+"""Running cohort aggregates over every scored student.
+
+The whole cohort is one array of counts: for each predicted role and each
+skill column of CleanedData.csv, a histogram of the answers on the
+questionnaire's 7-option scale. Role counts, per-skill sums and means all
+follow from it, and it stays 16 x 15 x 7 however many students are added.
+Adding rows is a single ``bincount``, and merging cohorts is addition.
+
+Each server process keeps its own cohort and writes it to a shard file under
+``analytics/``. Writes happen at most every ``CAREER_ANALYTICS_PERSIST``
+seconds and at exit. ``load_cohort`` adds up every shard, so the analytics
+page costs the same for ten students or ten million. Every server process
+and every ingest leaves one shard behind; ``compact`` merges those of exited
+processes so the directory does not keep growing.
+
+    python cohort_analytics.py ingest scored.csv          # add a batch_score.py output
+    python cohort_analytics.py merge --out cohort.npy     # one file from every shard
+    python cohort_analytics.py compact                    # merge shards of exited processes
+    python cohort_analytics.py show
+"""
+import argparse
+import atexit
+import glob
+import os
+import re
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+
+from assessment import Category_mapping, FEATURE_COLUMNS, options
+from instrumentation import register_gauges
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYTICS_DIR = os.environ.get("CAREER_ANALYTICS_DIR", os.path.join(BASE_DIR, "analytics"))
+# Seconds between writes of this process's shard; 0 turns recording off
+PERSIST_SECONDS = float(os.environ.get("CAREER_ANALYTICS_PERSIST", "10"))
+# The Cohort Analytics page is for career office staff; it only shows data with CAREER_COHORT_DASHBOARD=1
+DASHBOARD = os.environ.get("CAREER_COHORT_DASHBOARD", "0") == "1"
+
+ROLES = len(Category_mapping)
+SKILLS = len(FEATURE_COLUMNS)
+LEVELS = len(options)
+SHARD_PATTERN = "cohort-*.npy"
+_SHARD_NAME = re.compile(r"cohort-(.+)-(\d+)-\d{8}-\d{6}(-merged)?\.npy$")
+
+
+class Cohort:
+    """Answer histograms per (role, skill), shape ROLES x SKILLS x LEVELS"""
+
+    def __init__(self, histograms=None):
+        shape = (ROLES, SKILLS, LEVELS)
+        self.histograms = np.zeros(shape, dtype=np.int64) if histograms is None else np.asarray(histograms, np.int64)
+        if self.histograms.shape != shape:
+            raise ValueError(f"Cohort histograms must have shape {shape}, got {self.histograms.shape}")
+
+    @classmethod
+    def from_dataset(cls):
+        """The professionals in CleanedData.bin, as a cohort of their actual roles"""
+        import dataset
+
+        data = dataset.load()
+        cohort = cls()
+        cohort.add(data.features, data.labels)
+        return cohort
+
+    @classmethod
+    def load(cls, path):
+        return cls(np.load(path))
+
+    def add(self, answers, roles):
+        """Add rows of answers (option indices, FEATURE_COLUMNS order) with their predicted roles"""
+        answers = np.atleast_2d(np.asarray(answers, dtype=np.int64))
+        roles = np.atleast_1d(np.asarray(roles, dtype=np.int64))
+        if answers.shape != (len(roles), SKILLS):
+            raise ValueError(f"Expected {len(roles)} rows of {SKILLS} answers, got shape {answers.shape}")
+        if answers.size and (answers.min() < 0 or answers.max() >= LEVELS):
+            raise ValueError(f"Answers must be option indices between 0 and {LEVELS - 1}")
+        if roles.size and (roles.min() < 0 or roles.max() >= ROLES):
+            raise ValueError(f"Roles must be labels between 0 and {ROLES - 1}")
+        cells = (roles[:, np.newaxis] * SKILLS + np.arange(SKILLS)) * LEVELS + answers
+        self.histograms += np.bincount(cells.ravel(), minlength=self.histograms.size).reshape(self.histograms.shape)
+        return self
+
+    def merge(self, other):
+        return Cohort(self.histograms + other.histograms)
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        staging = f"{path}.tmp{os.getpid()}"
+        with open(staging, "wb") as f:
+            np.save(f, self.histograms)
+        os.replace(staging, path)
+
+    @property
+    def role_counts(self):
+        return self.histograms[:, 0, :].sum(axis=1)
+
+    @property
+    def total(self):
+        return int(self.role_counts.sum())
+
+    def role_shares(self):
+        total = self.total
+        return self.role_counts / total if total else np.zeros(ROLES)
+
+    def skill_sums(self):
+        return self.histograms @ np.arange(LEVELS)
+
+    def skill_means(self):
+        """Mean answer per (role, skill), NaN for roles nobody was predicted"""
+        counts = self.role_counts[:, np.newaxis]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, self.skill_sums() / counts, np.nan)
+
+    def skill_gaps(self, reference):
+        """Mean answer minus ``reference``'s mean per (role, skill); negative where this cohort rates lower"""
+        return self.skill_means() - reference.skill_means()
+
+
+def _shard_path(directory, suffix=""):
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+    return os.path.join(directory, f"cohort-{socket.gethostname()}-{os.getpid()}-{stamp}{suffix}.npy")
+
+
+class CohortRecorder:
+    """This process's cohort, written to its own shard in the background"""
+
+    def __init__(self, directory=ANALYTICS_DIR, interval=PERSIST_SECONDS):
+        self.directory = directory
+        self.interval = interval
+        self.path = _shard_path(directory)
+        self._cohort = Cohort()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._thread = None
+        self.recorded = 0
+        self.writes = 0
+        self.errors = 0
+        self.last_error = None
+
+    def record(self, answers, role):
+        with self._lock:
+            self._cohort.add(answers, [role])
+            self._dirty = True
+            self.recorded += 1
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="cohort-analytics", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.persist()
+            except Exception as exc:
+                # Keep running: the counts stay in memory and the next write retries
+                self.errors += 1
+                self.last_error = str(exc)
+
+    def persist(self):
+        with self._lock:
+            if not self._dirty:
+                return False
+            snapshot = Cohort(self._cohort.histograms.copy())
+            self._dirty = False
+        try:
+            snapshot.save(self.path)
+        except BaseException:
+            with self._lock:
+                self._dirty = True
+            raise
+        self.writes += 1
+        return True
+
+    def snapshot(self):
+        with self._lock:
+            return Cohort(self._cohort.histograms.copy())
+
+    def stats(self):
+        return {
+            "path": self.path,
+            "recorded": self.recorded,
+            "writes": self.writes,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+def load_cohort(directory=ANALYTICS_DIR, live=None):
+    """Every shard in ``directory`` added up, with ``live``'s unsaved counts in place of its shard"""
+    cohort = live.snapshot() if live is not None else Cohort()
+    for path in glob.glob(os.path.join(directory, SHARD_PATTERN)):
+        if live is None or os.path.abspath(path) != os.path.abspath(live.path):
+            cohort = cohort.merge(Cohort.load(path))
+    return cohort
+
+
+_professionals = None
+
+
+def professionals():
+    """The CleanedData.csv cohort, built once per process"""
+    global _professionals
+    if _professionals is None:
+        _professionals = Cohort.from_dataset()
+    return _professionals
+
+
+shared_recorder = CohortRecorder() if PERSIST_SECONDS > 0 else None
+if shared_recorder is not None:
+    atexit.register(shared_recorder.persist)
+
+
+def recorder_stats():
+    return shared_recorder.stats() if shared_recorder is not None else {}
+
+
+register_gauges("career_cohort_analytics", recorder_stats, "Cohort analytics recorder statistics.")
+
+
+def record_scored(answers, role):
+    """Count one scored student; ``answers`` are option indices in FEATURE_COLUMNS order"""
+    if shared_recorder is not None:
+        shared_recorder.record(answers, role)
+
+
+def ingest(path, directory=ANALYTICS_DIR, chunksize=100000):
+    """Add a scored CSV (skill columns plus batch_score.py's Predicted column) as a new shard"""
+    import pandas as pd
+
+    from batch_score import PREDICTION_COLUMN
+
+    cohort = Cohort()
+    for chunk in pd.read_csv(path, usecols=FEATURE_COLUMNS + [PREDICTION_COLUMN], chunksize=chunksize):
+        cohort.add(chunk[FEATURE_COLUMNS].to_numpy(), chunk[PREDICTION_COLUMN].to_numpy())
+    cohort.save(_shard_path(directory))
+    return cohort
+
+
+def _exited(path):
+    """Whether the process that wrote the shard at ``path`` has exited; only known for this host's shards"""
+    match = _SHARD_NAME.match(os.path.basename(path))
+    if match is None or match.group(1) != socket.gethostname() or int(match.group(2)) == os.getpid():
+        return False
+    try:
+        os.kill(int(match.group(2)), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def compact(directory=ANALYTICS_DIR):
+    """Merge the shards of this host's exited processes into one; returns how many were merged.
+
+    A running process rewrites its whole shard on every write, so its shard is
+    left alone. Until the old shards are removed, readers count them twice.
+    """
+    paths = [path for path in sorted(glob.glob(os.path.join(directory, SHARD_PATTERN))) if _exited(path)]
+    if len(paths) < 2:
+        return 0
+    cohort = Cohort()
+    for path in paths:
+        cohort = cohort.merge(Cohort.load(path))
+    # Named after this process, so a later compaction merges it again once it exits,
+    # and marked so it never replaces this process's own recorder shard
+    cohort.save(_shard_path(directory, "-merged"))
+    for path in paths:
+        os.remove(path)
+    return len(paths)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the cohort analytics aggregates")
+    parser.add_argument("--dir", default=ANALYTICS_DIR, help="directory holding the cohort shards")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest_parser = sub.add_parser("ingest")
+    ingest_parser.add_argument("scored", help="CSV written by batch_score.py")
+    merge_parser = sub.add_parser("merge")
+    merge_parser.add_argument("--out", required=True, help="file to write the merged cohort to")
+    sub.add_parser("compact")
+    sub.add_parser("show")
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        print(f"Added {ingest(args.scored, args.dir).total} scored students")
+        return 0
+    if args.command == "compact":
+        print(f"Merged {compact(args.dir)} shards of exited processes")
+        return 0
+    cohort = load_cohort(args.dir)
+    if args.command == "merge":
+        cohort.save(args.out)
+        print(f"Wrote {cohort.total} students to {args.out}")
+        return 0
+    print(f"{cohort.total} students")
+    for label in np.argsort(-cohort.role_counts, kind="stable"):
+        if cohort.role_counts[label]:
+            print(f"{Category_mapping[int(label)]:<40} {cohort.role_counts[label]:>8} "
+                  f"{cohort.role_shares()[label]:>7.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
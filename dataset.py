@@ -0,0 +1,249 @@
+"""Compact columnar binary copy of CleanedData.csv.
+
+Every value in the dataset (15 skill columns and the encoded ``Role``) fits in
+a byte, so ``build`` stores each column as one contiguous run of uint8 values,
+followed by the distinct rows and how often each occurs. ``load`` memory-maps
+the file and returns NumPy views into it without copying or parsing anything.
+
+Layout: the 8-byte magic, a little-endian uint32 header length, a JSON header
+describing the columns and the byte offset, shape and dtype of every section,
+then the sections themselves, each aligned to 64 bytes.
+
+    python dataset.py build    # CleanedData.csv -> CleanedData.bin
+    python dataset.py check    # is the binary still in sync with the CSV?
+    python dataset.py bench    # load + deduplicate timings against pandas.read_csv
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+
+from assessment import FEATURE_COLUMNS, LABEL_COLUMN
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CSV_PATH = os.path.join(BASE_DIR, "CleanedData.csv")
+DATASET_PATH = os.path.join(BASE_DIR, "CleanedData.bin")
+
+MAGIC = b"CAREERDS"
+FORMAT_VERSION = 1
+_ALIGN = 64
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_csv(path=CSV_PATH):
+    """Parse the CSV into (column names, uint8 matrix of shape rows x columns)"""
+    with open(path) as f:
+        columns = f.readline().strip().split(",")
+    data = np.loadtxt(path, delimiter=",", skiprows=1, dtype=np.int64, ndmin=2)
+    if data.size and (data.min() < 0 or data.max() > 255):
+        raise ValueError("Every value must fit in an unsigned byte")
+    return columns, data.astype(np.uint8)
+
+
+def unique_rows(rows):
+    """Collapse duplicate rows of a uint8 matrix into (unique rows, counts).
+
+    Rows of up to 16 bytes are viewed as two big-endian uint64 keys, so the
+    sort is a two-key lexsort rather than ``np.unique(axis=0)``'s generic
+    lexicographic one. The result is in the same order either way.
+    """
+    rows = np.asarray(rows, dtype=np.uint8)
+    if rows.shape[1] > 16:
+        return np.unique(rows, axis=0, return_counts=True)
+    padded = np.zeros((len(rows), 16), dtype=np.uint8)
+    padded[:, :rows.shape[1]] = rows
+    keys = padded.view(">u8")
+    order = np.lexsort((keys[:, 1], keys[:, 0]))
+    keys = keys[order]
+    starts = np.flatnonzero(np.concatenate([[True], np.any(keys[1:] != keys[:-1], axis=1)]))
+    counts = np.diff(np.append(starts, len(keys)))
+    return padded[order[starts], :rows.shape[1]], counts
+
+
+def _aligned(offset):
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def write(path, columns, data, source_sha256=None):
+    """Write a rows x columns uint8 matrix in the columnar layout"""
+    uniques, counts = unique_rows(data)
+    sections = [
+        ("columns", np.ascontiguousarray(data.T)),
+        ("unique_rows", np.ascontiguousarray(uniques.T)),
+        ("unique_counts", counts.astype("<u4")),
+    ]
+    header = {
+        "format_version": FORMAT_VERSION,
+        "columns": columns,
+        "rows": len(data),
+        "unique_rows": len(uniques),
+        "source_sha256": source_sha256,
+        "sections": {},
+    }
+    # Offsets depend on the header size, so lay the sections out after a
+    # generous estimate of it and pad the header up to the first section.
+    estimate = _aligned(len(MAGIC) + 4 + len(json.dumps(header)) + 128 * len(sections) + _ALIGN)
+    offset = estimate
+    for name, array in sections:
+        header["sections"][name] = {"offset": offset, "shape": list(array.shape), "dtype": array.dtype.str}
+        offset = _aligned(offset + array.nbytes)
+    encoded = json.dumps(header).encode()
+    if len(MAGIC) + 4 + len(encoded) > estimate:
+        raise ValueError("Dataset header does not fit before the first section")
+    encoded = encoded.ljust(estimate - len(MAGIC) - 4)
+    staging = f"{path}.tmp{os.getpid()}"
+    with open(staging, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+        for name, array in sections:
+            f.seek(header["sections"][name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(offset)
+    os.replace(staging, path)
+    return header
+
+
+def build(csv_path=CSV_PATH, path=DATASET_PATH):
+    columns, data = read_csv(csv_path)
+    return write(path, columns, data, _sha256(csv_path))
+
+
+def read_header(path=DATASET_PATH):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a career dataset file")
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length))
+    if header["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported dataset format {header['format_version']}")
+    return header
+
+
+class Dataset:
+    """Read-only views into a memory-mapped dataset file"""
+
+    def __init__(self, path=DATASET_PATH):
+        self.path = path
+        self.header = read_header(path)
+        self.columns = self.header["columns"]
+        self._raw = np.memmap(path, dtype=np.uint8, mode="r")
+        # One row per column; everything below is a view of this mapping
+        self.data = self._section("columns")
+        self.unique_data = self._section("unique_rows")
+        self.counts = self._section("unique_counts")
+
+    def _section(self, name):
+        spec = self.header["sections"][name]
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        raw = self._raw[spec["offset"]:spec["offset"] + count * dtype.itemsize]
+        return np.asarray(raw).view(dtype).reshape(spec["shape"])
+
+    def __len__(self):
+        return self.header["rows"]
+
+    def __getitem__(self, column):
+        return self.data[self.columns.index(column)]
+
+    def _feature_indices(self):
+        return [self.columns.index(c) for c in FEATURE_COLUMNS]
+
+    @property
+    def features(self):
+        """rows x 15 skill answers in FEATURE_COLUMNS order (a transposed view)"""
+        indices = self._feature_indices()
+        if indices == list(range(len(indices))):
+            return self.data[:len(indices)].T
+        return self.data[indices].T
+
+    @property
+    def labels(self):
+        return self[LABEL_COLUMN]
+
+    @property
+    def unique(self):
+        """Distinct complete rows (answers and role) as a rows x columns view"""
+        return self.unique_data.T
+
+    def unique_features(self):
+        """Distinct answer vectors and how many rows share each, ignoring the role"""
+        indices = self._feature_indices()
+        rows, inverse = np.unique(self.unique_data[indices].T, axis=0, return_inverse=True)
+        return rows, np.bincount(inverse.ravel(), weights=self.counts, minlength=len(rows)).astype(np.int64)
+
+    def is_current(self, csv_path=CSV_PATH):
+        return self.header["source_sha256"] == _sha256(csv_path)
+
+
+def load(path=DATASET_PATH):
+    return Dataset(path)
+
+
+def bench(csv_path=CSV_PATH, path=DATASET_PATH, repeats=20):
+    import pandas as pd
+
+    def best(func):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000
+
+    def with_pandas():
+        frame = pd.read_csv(csv_path)
+        return frame.value_counts()
+
+    def with_binary():
+        dataset = load(path)
+        return dataset.unique, dataset.counts
+
+    def with_binary_recount():
+        dataset = load(path)
+        return unique_rows(dataset.data.T)
+
+    return {
+        "pandas_read_csv_value_counts_ms": best(with_pandas),
+        "binary_load_stored_unique_ms": best(with_binary),
+        "binary_load_recount_unique_ms": best(with_binary_recount),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert CleanedData.csv to the compact binary dataset format")
+    parser.add_argument("command", choices=["build", "check", "bench"])
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--out", default=DATASET_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        header = build(args.csv, args.out)
+        print(f"Wrote {args.out}: {header['rows']} rows, {header['unique_rows']} distinct, "
+              f"{os.path.getsize(args.out)} bytes (CSV {os.path.getsize(args.csv)} bytes)")
+        return 0
+    if args.command == "check":
+        dataset = load(args.out)
+        _, csv_data = read_csv(args.csv)
+        if not dataset.is_current(args.csv) or not np.array_equal(dataset.data.T, csv_data):
+            print(f"{args.out} is out of date; run 'python dataset.py build'", file=sys.stderr)
+            return 1
+        print(f"{args.out} matches {args.csv}")
+        return 0
+    for name, ms in bench(args.csv, args.out).items():
+        print(f"{name:<36} {ms:8.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
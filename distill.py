@@ -0,0 +1,181 @@
+"""Distil the stacked ensemble into smaller, faster student models.
+
+Students are trained on the ensemble's own predictions over the distinct
+answer vectors in CleanedData.bin plus synthetic ones (real rows with a few
+answers nudged, and uniformly random vectors), then compared on held-out
+vectors: how often they agree with the ensemble, how long a single prediction
+takes and how large the pickled model is. Agreement is reported on held-out
+vectors and on every real answer pattern, most of which the students were
+trained on. The table marks the Pareto-optimal students; ``select`` installs
+one as FastModel.sav, which the app serves when ``CAREER_MODEL_BACKEND=fast``.
+All vectors are in the encoding the page sends the model (see
+``assessment.model_inputs``).
+
+    python distill.py run                 # train students, print the table
+    python distill.py select tree_depth18 # serve that student as the fast model
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import warnings
+
+import numpy as np
+
+import dataset
+from benchmark import measure
+from assessment import MAX_LEVEL, model_inputs
+from model_provider import FAST_MODEL_PATH, create_provider
+from train import RANDOM_STATE
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STUDENTS_DIR = os.path.join(BASE_DIR, "models", "students")
+# The student installed as FastModel.sav, and the transfer set it is trained on
+FAST_STUDENT = "tree_depth18"
+SYNTHETIC_VECTORS = 60000
+HOLDOUT_FRACTION = 0.2
+
+
+def students():
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.tree import DecisionTreeClassifier
+
+    return {
+        "tree_depth6": DecisionTreeClassifier(max_depth=6, random_state=RANDOM_STATE),
+        "tree_depth10": DecisionTreeClassifier(max_depth=10, random_state=RANDOM_STATE),
+        "tree_depth14": DecisionTreeClassifier(max_depth=14, random_state=RANDOM_STATE),
+        "tree_depth18": DecisionTreeClassifier(max_depth=18, random_state=RANDOM_STATE),
+        "logistic": LogisticRegression(max_iter=2000),
+        "boosted_small": HistGradientBoostingClassifier(max_iter=40, max_depth=4, learning_rate=0.2,
+                                                        early_stopping=False, random_state=RANDOM_STATE),
+    }
+
+
+def synthetic_answers(real, count, rng):
+    """Half perturbed copies of real rows, half uniformly random answer vectors"""
+    perturbed = real[rng.integers(0, len(real), count // 2)].astype(np.int64)
+    mask = rng.random(perturbed.shape) < 0.2
+    perturbed[mask] += rng.choice([-1, 1], size=int(mask.sum()))
+    uniform = rng.integers(0, MAX_LEVEL + 1, (count - len(perturbed), real.shape[1]))
+    return np.clip(np.vstack([perturbed, uniform]), 0, MAX_LEVEL).astype(np.uint8)
+
+
+def build_transfer_set(synthetic, holdout_fraction, seed):
+    """Distinct real and synthetic vectors, split into training and held-out parts"""
+    rng = np.random.default_rng(seed)
+    real, _ = dataset.unique_rows(model_inputs(dataset.load().unique_features()[0]))
+    vectors, _ = dataset.unique_rows(np.vstack([real, synthetic_answers(real, synthetic, rng)]))
+    order = rng.permutation(len(vectors))
+    split = int(len(vectors) * (1 - holdout_fraction))
+    return vectors[order[:split]].astype(np.float64), vectors[order[split:]].astype(np.float64), real
+
+
+def profile(model, X_eval, y_eval, X_real, y_real, repeats):
+    rows = iter(np.resize(np.arange(len(X_eval)), repeats + 1))
+    latency = measure(lambda: model.predict(X_eval[next(rows)][np.newaxis, :]), repeats)
+    return {
+        "agreement_holdout": float(np.mean(model.predict(X_eval) == y_eval)),
+        "agreement_real": float(np.mean(model.predict(X_real) == y_real)),
+        "latency_median_ms": latency["median_ms"],
+        "latency_p95_ms": latency["p95_ms"],
+        "size_bytes": len(pickle.dumps(model)),
+    }
+
+
+def pareto_front(report):
+    """Names of entries no other entry beats on agreement, latency and size at once"""
+    def dominates(a, b):
+        better_or_equal = (a["agreement_holdout"] >= b["agreement_holdout"]
+                           and a["latency_median_ms"] <= b["latency_median_ms"]
+                           and a["size_bytes"] <= b["size_bytes"])
+        strictly = (a["agreement_holdout"] > b["agreement_holdout"]
+                    or a["latency_median_ms"] < b["latency_median_ms"]
+                    or a["size_bytes"] < b["size_bytes"])
+        return better_or_equal and strictly
+
+    return {name for name, entry in report.items()
+            if not any(dominates(other, entry) for key, other in report.items() if key != name)}
+
+
+def fit_student(student, X, y):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return student.fit(X, y)
+
+
+def rebuild_fast_model(teacher, name=FAST_STUDENT, seed=RANDOM_STATE):
+    """Distil ``teacher`` into student ``name`` as ``run`` does and install it as FastModel.sav"""
+    import joblib
+
+    X_train, _, _ = build_transfer_set(SYNTHETIC_VECTORS, HOLDOUT_FRACTION, seed)
+    student = fit_student(students()[name], X_train, teacher.predict(X_train))
+    staging = f"{FAST_MODEL_PATH}.tmp{os.getpid()}"
+    joblib.dump(student, staging)
+    os.replace(staging, FAST_MODEL_PATH)
+    return student
+
+
+def run(args):
+    import joblib
+
+    teacher = create_provider(args.teacher).get()
+    X_train, X_eval, real = build_transfer_set(args.synthetic, args.holdout, args.seed)
+    X_real = real.astype(np.float64)
+    y_train, y_eval, y_real = teacher.predict(X_train), teacher.predict(X_eval), teacher.predict(X_real)
+    print(f"Transfer set: {len(X_train)} training and {len(X_eval)} held-out vectors")
+
+    report = {"ensemble": profile(teacher, X_eval, y_eval, X_real, y_real, args.repeats)}
+    os.makedirs(args.out_dir, exist_ok=True)
+    for name, student in students().items():
+        fit_student(student, X_train, y_train)
+        report[name] = profile(student, X_eval, y_eval, X_real, y_real, args.repeats)
+        joblib.dump(student, os.path.join(args.out_dir, f"{name}.sav"))
+
+    front = pareto_front(report)
+    print(f"{'model':<15} {'agree held-out':>14} {'agree real':>10} {'median ms':>10} {'p95 ms':>8} "
+          f"{'size KB':>9}  pareto")
+    for name, entry in sorted(report.items(), key=lambda item: item[1]["latency_median_ms"]):
+        entry["pareto"] = name in front
+        print(f"{name:<15} {entry['agreement_holdout']:>14.4f} {entry['agreement_real']:>10.4f} "
+              f"{entry['latency_median_ms']:>10.3f} {entry['latency_p95_ms']:>8.3f} "
+              f"{entry['size_bytes'] / 1024:>9.1f}  {'*' if entry['pareto'] else ''}")
+    with open(os.path.join(args.out_dir, "report.json"), "w") as f:
+        json.dump({"teacher": args.teacher, "synthetic": args.synthetic, "seed": args.seed,
+                   "training_vectors": len(X_train), "holdout_vectors": len(X_eval), "models": report}, f, indent=2)
+    return 0
+
+
+def select(args):
+    source = os.path.join(args.out_dir, f"{args.name}.sav")
+    if not os.path.exists(source):
+        print(f"No student named {args.name!r} in {args.out_dir}; run 'python distill.py run' first",
+              file=sys.stderr)
+        return 1
+    staging = f"{FAST_MODEL_PATH}.tmp{os.getpid()}"
+    shutil.copyfile(source, staging)
+    os.replace(staging, FAST_MODEL_PATH)
+    print(f"Installed {args.name} as {FAST_MODEL_PATH}; serve it with CAREER_MODEL_BACKEND=fast")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Distil the ensemble into faster student models")
+    parser.add_argument("--out-dir", default=STUDENTS_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run")
+    run_parser.add_argument("--teacher", default="sklearn", help="model backend to distil")
+    run_parser.add_argument("--synthetic", type=int, default=SYNTHETIC_VECTORS, help="synthetic answer vectors to add")
+    run_parser.add_argument("--holdout", type=float, default=HOLDOUT_FRACTION, help="fraction of vectors held out")
+    run_parser.add_argument("--repeats", type=int, default=300)
+    run_parser.add_argument("--seed", type=int, default=RANDOM_STATE)
+    select_parser = sub.add_parser("select")
+    select_parser.add_argument("name")
+    args = parser.parse_args(argv)
+    return run(args) if args.command == "run" else select(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Run model inference on a shared, bounded thread pool with a timeout.
+
+The Streamlit script thread submits its prediction here and waits at most
+``CAREER_PREDICT_TIMEOUT`` seconds. If the model has not answered by then
+(cold load, GC pause, a busy CPU), or if ``CAREER_PREDICT_MAX_PENDING``
+predictions are already queued or running, the page gets a ranking from the
+prediction cache or from the distilled fast model instead. A late result from
+the full model still lands in the prediction cache, so the next submit of the
+same answers gets it.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from instrumentation import register_gauges, stage_histogram, timer
+from model_provider import get_fast_model, get_model
+from prediction_cache import answers_key, shared_cache
+from ranking import rank_roles
+
+PREDICT_TIMEOUT = float(os.environ.get("CAREER_PREDICT_TIMEOUT", "2.0"))
+PREDICT_WORKERS = int(os.environ.get("CAREER_PREDICT_WORKERS", "2"))
+# Predictions queued or running at once; further submits fall back straight away
+MAX_PENDING = int(os.environ.get("CAREER_PREDICT_MAX_PENDING", "16"))
+
+# Where a ranking came from
+SOURCE_MODEL = "model"
+SOURCE_CACHE = "cache"
+SOURCE_FAST = "fast"
+
+
+class PoolFull(RuntimeError):
+    pass
+
+
+class InferencePool:
+    """ThreadPoolExecutor that refuses work beyond ``max_pending`` calls in flight"""
+
+    def __init__(self, workers=PREDICT_WORKERS, max_pending=MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._lock = threading.Lock()
+        self._queue_wait = stage_histogram("predict_queue_wait")
+        self.pending = 0
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def submit(self, func, *args):
+        """Run ``func(*args)`` on the pool; raises PoolFull when it is at capacity"""
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PoolFull(f"{self.pending} predictions already in flight")
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="career-predict")
+            self.pending += 1
+            self.submitted += 1
+        return self._executor.submit(self._run, func, args, time.perf_counter())
+
+    def _run(self, func, args, queued_at):
+        self._queue_wait.observe(time.perf_counter() - queued_at)
+        with self._lock:
+            self.running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.pending -= 1
+                self.completed += 1
+
+    def call(self, func, *args, timeout=PREDICT_TIMEOUT):
+        """Submit and wait; raises PoolFull, or TimeoutError with the future still running"""
+        future = self.submit(func, *args)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"no prediction within {timeout}s") from None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "queue_depth": self.pending - self.running,
+                "running": self.running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+
+
+def _rank_and_cache(answers, version, key, cache):
+    with timer("predict"):
+        ranking = rank_roles(get_model(version), answers)
+    cache.put(key, ranking)
+    return ranking
+
+
+def predict_ranking(answers, version=None, timeout=PREDICT_TIMEOUT, pool=None, cache=None):
+    """Rank every role for one answer vector without blocking for more than ``timeout``.
+
+    ``version`` is the model version the session is pinned to. Returns
+    (ranking, source), where source is SOURCE_MODEL, or SOURCE_CACHE /
+    SOURCE_FAST when the shared model was too slow or the pool was full.
+    Fallback rankings are not cached.
+    """
+    pool = shared_pool if pool is None else pool
+    cache = shared_cache if cache is None else cache
+    key = answers_key(answers, version)
+    try:
+        with timer("predict_wait"):
+            return pool.call(_rank_and_cache, answers, version, key, cache, timeout=timeout), SOURCE_MODEL
+    except (PoolFull, TimeoutError):
+        pass
+    # Another session may have ranked the same answers while we waited
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, SOURCE_CACHE
+    try:
+        fast_model = get_fast_model()
+    except OSError:
+        # No fast model installed: waiting for the full model is all that is left
+        with timer("predict"):
+            return rank_roles(get_model(version), answers), SOURCE_MODEL
+    with timer("predict_fast"):
+        return rank_roles(fast_model, answers), SOURCE_FAST
+
+
+shared_pool = InferencePool()
+register_gauges("career_inference_pool", shared_pool.stats, "Inference thread pool statistics.")
@@ -0,0 +1,260 @@
+"""Headless HTTP JSON API for career predictions.
+
+Serves the same model and questionnaire mappings as the Streamlit app so other
+systems (such as the LMS) can request predictions without the UI. Requests
+arriving within a short window are merged by a micro-batcher into a single
+vectorized ``predict`` call.
+
+    python inference_service.py --port 8000 --window-ms 5
+
+    POST /predict   {"answers": [15 integers]}
+                    {"responses": {question: option}} or {"responses": [15 options]}
+                    optionally with "top_k" (default 3) ranked matches in the reply
+    GET  /health
+    GET  /stats
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from assessment import mapping, options, questions
+from model_provider import MODEL_BACKEND, MODEL_BACKENDS, create_provider
+from ranking import rank_roles, role_name
+
+MAX_BODY_BYTES = 64 * 1024
+# Largest value a mapped answer can take in the training data (CleanedData.csv)
+MAX_ANSWER_VALUE = 6
+DEFAULT_TOP_K = 3
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def parse_answers(payload):
+    """Turn a /predict request body into the numeric answer vector"""
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object")
+    if "answers" in payload:
+        answers = payload["answers"]
+        if not isinstance(answers, list) or len(answers) != len(questions):
+            raise ValueError(f"'answers' must be a list of {len(questions)} integers")
+        for value in answers:
+            if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_ANSWER_VALUE:
+                raise ValueError(f"Answers must be integers between 0 and {MAX_ANSWER_VALUE}")
+        return answers
+    if "responses" in payload:
+        responses = payload["responses"]
+        if isinstance(responses, dict):
+            missing = [q for q in questions if q not in responses]
+            if missing:
+                raise ValueError(f"Missing responses for {len(missing)} questions")
+            responses = [responses[q] for q in questions]
+        if not isinstance(responses, list) or len(responses) != len(questions):
+            raise ValueError(f"'responses' must cover all {len(questions)} questions")
+        unknown = sorted({str(r) for r in responses if r not in options})
+        if unknown:
+            raise ValueError(f"Unknown options {unknown}, expected one of {options}")
+        return [mapping(r) for r in responses]
+    raise ValueError("Request body needs an 'answers' or 'responses' field")
+
+
+class MicroBatcher:
+    """Collects concurrent single-row requests into batched predictions.
+
+    The first queued row opens a batch; the batcher then waits ``window``
+    seconds for more rows (up to ``max_batch``) before running them all through
+    one ``predict_batch`` call on a worker thread.
+    """
+
+    def __init__(self, predict_batch, window=0.005, max_batch=64):
+        self._predict_batch = predict_batch
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = None
+        self._task = None
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+        self.predict_seconds = 0.0
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, row):
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((row, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            if self.window > 0:
+                await asyncio.sleep(self.window)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            rows = [row for row, _ in batch]
+            start = time.perf_counter()
+            try:
+                labels = await loop.run_in_executor(None, self._predict_batch, rows)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            finally:
+                self.predict_seconds += time.perf_counter() - start
+            for (_, future), label in zip(batch, labels):
+                if not future.done():
+                    future.set_result(label)
+            self.batches += 1
+            self.rows += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self):
+        return {
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch,
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else None,
+            "largest_batch": self.largest_batch,
+            "predict_seconds": self.predict_seconds,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+class InferenceService:
+    def __init__(self, model, window=0.005, max_batch=64):
+        self.model = model
+        self.batcher = MicroBatcher(self._predict_batch, window, max_batch)
+        self.requests = 0
+        self.errors = 0
+
+    def _predict_batch(self, rows):
+        return rank_roles(self.model, rows)
+
+    async def predict(self, payload):
+        answers = parse_answers(payload)
+        top_k = payload.get("top_k", DEFAULT_TOP_K)
+        if not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1:
+            raise ValueError("'top_k' must be a positive integer")
+        ranking = await self.batcher.predict(answers)
+        label, probability = ranking[0]
+        return {
+            "prediction": label,
+            "role": role_name(label),
+            "probability": probability,
+            "matches": [{"prediction": label, "role": role_name(label), "probability": probability}
+                        for label, probability in ranking[:top_k]],
+        }
+
+    async def dispatch(self, method, path, body):
+        path = path.split("?", 1)[0]
+        if path == "/predict":
+            if method != "POST":
+                return 405, {"error": "Use POST for /predict"}
+            try:
+                payload = json.loads(body or b"null")
+                return 200, await self.predict(payload)
+            except ValueError as exc:
+                return 400, {"error": str(exc)}
+        if path == "/health" and method == "GET":
+            return 200, {"status": "ok"}
+        if path == "/stats" and method == "GET":
+            return 200, {"requests": self.requests, "errors": self.errors, "batcher": self.batcher.stats()}
+        return 404, {"error": f"No route for {method} {path}"}
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": f"Body exceeds {MAX_BODY_BYTES} bytes"}
+                    headers["connection"] = "close"
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    self.requests += 1
+                    try:
+                        status, payload = await self.dispatch(method, path, body)
+                    except Exception as exc:
+                        status, payload = 500, {"error": f"{type(exc).__name__}: {exc}"}
+                if status >= 400:
+                    self.errors += 1
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host, port, ready=None):
+        self.batcher.start()
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready is not None:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve career predictions over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--window-ms", type=float, default=5.0,
+                        help="how long a batch waits for more requests (0 = only those already queued)")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--backend", default=MODEL_BACKEND, choices=MODEL_BACKENDS)
+    args = parser.parse_args(argv)
+
+    model = create_provider(args.backend).get()
+    service = InferenceService(model, args.window_ms / 1000, args.max_batch)
+
+    def ready(server):
+        address = server.sockets[0].getsockname()
+        print(f"Serving predictions on http://{address[0]}:{address[1]} "
+              f"(window {args.window_ms}ms, max batch {args.max_batch})", flush=True)
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Lightweight stage timers aggregated into in-process histograms.
+
+    with timer("predict"):
+        prediction = model.predict(...)
+
+Each stage gets a fixed-bucket histogram shared by every session in the
+process. ``export_prometheus`` renders them, plus any registered gauges, in
+the Prometheus text exposition format. Set ``CAREER_METRICS=0`` to turn the
+timers into no-ops.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+ENABLED = os.environ.get("CAREER_METRICS", "1") != "0"
+# Show the metrics panel in the Skills Assessment sidebar (for admins/debugging)
+DEBUG_PANEL = os.environ.get("CAREER_DEBUG_PANEL", "0") == "1"
+
+STAGE_METRIC = "career_stage_seconds"
+# Upper bounds in seconds; anything slower lands in the implicit +Inf bucket
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._counts), self._sum, self._count
+
+    def quantile(self, q):
+        """Estimate a quantile by interpolating inside the matching bucket"""
+        counts, _, total = self.snapshot()
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= target:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    return lower
+                return lower + (self.buckets[index] - lower) * (target - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram):
+        self._histogram = histogram
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._histogram.observe(time.perf_counter() - self._start)
+        return False
+
+
+_NULL_TIMER = nullcontext()
+_stages = {}
+_stages_lock = threading.Lock()
+_gauges = {}
+_infos = {}
+
+
+def stage_histogram(stage):
+    histogram = _stages.get(stage)
+    if histogram is None:
+        with _stages_lock:
+            histogram = _stages.setdefault(stage, Histogram())
+    return histogram
+
+
+def timer(stage):
+    """Context manager that records the duration of ``stage``"""
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(stage_histogram(stage))
+
+
+def observe(stage, seconds):
+    """Record a duration of ``stage`` that the caller measured itself"""
+    if ENABLED:
+        stage_histogram(stage).observe(seconds)
+
+
+def register_gauges(name, collect, help_text=""):
+    """Export the numeric values returned by ``collect()`` as gauges.
+
+    ``collect`` returns a dict; each numeric entry becomes ``<name>_<key>``.
+    """
+    _gauges[name] = (collect, help_text)
+
+
+def register_info(name, collect, help_text=""):
+    """Export the string labels returned by ``collect()`` as a ``<name>_info`` metric with value 1"""
+    _infos[name] = (collect, help_text)
+
+
+def stage_summaries():
+    """Per-stage count, mean and estimated p50/p95/p99 in seconds"""
+    summaries = {}
+    for stage, histogram in sorted(_stages.items()):
+        _, total, count = histogram.snapshot()
+        summaries[stage] = {
+            "count": count,
+            "mean": total / count if count else None,
+            "p50": histogram.quantile(0.5),
+            "p95": histogram.quantile(0.95),
+            "p99": histogram.quantile(0.99),
+        }
+    return summaries
+
+
+def _format_value(value):
+    return repr(float(value)) if value != float("inf") else "+Inf"
+
+
+def export_prometheus():
+    """Render every histogram and gauge in Prometheus text format"""
+    lines = [
+        f"# HELP {STAGE_METRIC} Time spent in each stage of the assessment submit path.",
+        f"# TYPE {STAGE_METRIC} histogram",
+    ]
+    for stage, histogram in sorted(_stages.items()):
+        counts, total, count = histogram.snapshot()
+        cumulative = 0
+        for bound, bucket_count in zip(histogram.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            lines.append(f'{STAGE_METRIC}_bucket{{stage="{stage}",le="{_format_value(bound)}"}} {cumulative}')
+        lines.append(f'{STAGE_METRIC}_sum{{stage="{stage}"}} {_format_value(total)}')
+        lines.append(f'{STAGE_METRIC}_count{{stage="{stage}"}} {count}')
+    for name, (collect, help_text) in sorted(_gauges.items()):
+        for key, value in sorted(collect().items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            metric = f"{name}_{key}"
+            if help_text:
+                lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {_format_value(value)}")
+    for name, (collect, help_text) in sorted(_infos.items()):
+        metric = f"{name}_info"
+        labels = ",".join(f'{key}="{value}"' for key, value in sorted(collect().items()))
+        if help_text:
+            lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{{{labels}}} 1")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _stages_lock:
+        _stages.clear()
@@ -0,0 +1,162 @@
+"""Memory-mapped model layouts shared through the page cache.
+
+Every Streamlit server process normally unpickles its own copy of the
+ensemble. The layouts built here keep the numeric arrays in separate,
+uncompressed blocks that are memory-mapped on load instead, so all processes
+on a host read the same physical pages:
+
+* ``EnsembleModel.joblib`` - the scikit-learn ensemble dumped uncompressed and
+  loaded with ``mmap_mode="c"``. libsvm refuses read-only buffers, so the maps
+  are copy-on-write; nothing writes to them, so the pages stay shared.
+* ``EnsembleModel.arrays/`` - one ``.npy`` file per array of the NumPy engine
+  (including its derived arrays), mapped read-only.
+
+    python mmap_model.py build                  # write both layouts from EnsembleModel.sav
+
+Both layouts are written to staging paths and checked against the model on
+every row of CleanedData.csv before either replaces the files being served.
+    python mmap_model.py report --workers 4     # RSS/PSS per process for each backend
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+
+import numpy_model
+from model_provider import BASE_DIR, MODEL_PATH, MMAP_MODEL_PATH, NUMPY_MMAP_DIR, WARM_UP_ROW, create_provider
+
+_MB = 1024 * 1024
+
+
+def check_layouts(model, joblib_path, arrays_dir, X):
+    """Raise RuntimeError unless both layouts, loaded as the app loads them, predict as ``model`` does"""
+    import joblib
+
+    # Copy-on-write, as model_provider maps it for libsvm
+    layouts = {"sklearn_mmap": joblib.load(joblib_path, mmap_mode="c"),
+               "numpy_mmap": numpy_model.NumpyEnsemble.load_mmap(arrays_dir)}
+    for backend, layout in layouts.items():
+        check = numpy_model.verify(layout, model, X)
+        if check["mismatches"]:
+            raise RuntimeError(f"{backend}: {check['mismatches']} label mismatches over {check['rows']} rows")
+
+
+def build(model_path=MODEL_PATH, joblib_path=MMAP_MODEL_PATH, arrays_dir=NUMPY_MMAP_DIR,
+          data_path=os.path.join(BASE_DIR, "CleanedData.csv")):
+    """Write both layouts of the model at ``model_path``, replacing the old ones only once they check out"""
+    import joblib
+
+    model = joblib.load(model_path)
+    joblib_staging = f"{joblib_path}.tmp{os.getpid()}"
+    arrays_staging = f"{os.path.abspath(arrays_dir)}.new{os.getpid()}"
+    try:
+        joblib.dump(model, joblib_staging, compress=0)
+        numpy_model.save_dir(numpy_model.with_derived(numpy_model.export_ensemble(model)), arrays_staging)
+        check_layouts(model, joblib_staging, arrays_staging, numpy_model.load_features(data_path))
+    except BaseException:
+        if os.path.exists(joblib_staging):
+            os.remove(joblib_staging)
+        shutil.rmtree(arrays_staging, ignore_errors=True)
+        raise
+    os.replace(joblib_staging, joblib_path)
+    numpy_model.replace_dir(arrays_staging, arrays_dir)
+    return model
+
+
+def read_memory(pid="self", artifact=None):
+    """RSS, PSS and USS of a process in bytes, from /proc (Linux only).
+
+    With ``artifact`` also report how much of the RSS is pages mapped from
+    files under that path.
+    """
+    usage = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                usage[name] = int(value.split()[0]) * 1024
+    memory = {"rss": usage["Rss"], "pss": usage["Pss"], "uss": usage["Private_Clean"] + usage["Private_Dirty"]}
+    if artifact is not None:
+        mapped, in_artifact = 0, False
+        with open(f"/proc/{pid}/smaps") as f:
+            for line in f:
+                fields = line.split()
+                if "-" in fields[0] and not fields[0].endswith(":"):
+                    in_artifact = len(fields) > 5 and fields[5].startswith(artifact)
+                elif in_artifact and fields[0] == "Rss:":
+                    mapped += int(fields[1]) * 1024
+        memory["artifact_rss"] = mapped
+    return memory
+
+
+def _worker(backend, ready, done):
+    model = create_provider(backend).get()
+    model.predict(WARM_UP_ROW)
+    ready.put(os.getpid())
+    # Keep the model (and its mappings) alive until the parent has measured us
+    done.wait()
+    return model
+
+
+def measure_backend(backend, workers):
+    """Start ``workers`` processes that each load ``backend``, and measure them all while alive"""
+    context = multiprocessing.get_context("spawn")
+    ready, done = context.Queue(), context.Event()
+    processes = [context.Process(target=_worker, args=(backend, ready, done), daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        pids = [ready.get(timeout=300) for _ in processes]
+        artifact = create_provider(backend).path
+        samples = [read_memory(pid, artifact) for pid in pids]
+    finally:
+        done.set()
+        for process in processes:
+            process.join()
+    return {key: sum(s[key] for s in samples) / len(samples) for key in samples[0]}
+
+
+def report(backends, workers, baseline="sklearn"):
+    results = {backend: measure_backend(backend, workers) for backend in backends}
+    print(f"{workers} processes per backend, mean per process:")
+    print(f"{'backend':<14} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8} {'mapped MB':>10} {'PSS saved':>10}")
+    for backend, memory in results.items():
+        saved = results[baseline]["pss"] - memory["pss"] if baseline in results else 0
+        memory["pss_saved"] = saved
+        print(f"{backend:<14} {memory['rss'] / _MB:>8.1f} {memory['pss'] / _MB:>8.1f} {memory['uss'] / _MB:>8.1f} "
+              f"{memory['artifact_rss'] / _MB:>10.2f} {saved / _MB:>10.2f}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and measure the memory-mapped model layouts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_parser = sub.add_parser("build")
+    build_parser.add_argument("--model", default=MODEL_PATH)
+    report_parser = sub.add_parser("report")
+    report_parser.add_argument("--workers", type=int, default=4)
+    report_parser.add_argument("--backends", default="sklearn,sklearn_mmap,numpy,numpy_mmap")
+    report_parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        try:
+            build(args.model)
+        except RuntimeError as exc:
+            print(f"Kept the previous layouts: {exc}", file=sys.stderr)
+            return 1
+        print(f"Checked both layouts against every row of CleanedData.csv; wrote {MMAP_MODEL_PATH} "
+              f"and {NUMPY_MMAP_DIR}")
+        return 0
+
+    results = report(args.backends.split(","), args.workers)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
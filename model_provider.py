@@ -0,0 +1,262 @@
+"""Process-wide access to the trained career prediction model.
+
+Streamlit re-executes page scripts on every interaction, but imported modules
+stay in ``sys.modules`` for the lifetime of the server process. Keeping the
+model here means it is deserialized once and shared by every session.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import model_registry
+from instrumentation import register_gauges, register_info
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_PATH = os.path.join(BASE_DIR, "EnsembleModel.sav")
+NUMPY_MODEL_PATH = os.path.join(BASE_DIR, "EnsembleModel.npz")
+# Memory-mapped layouts of the same two models, built by mmap_model.py
+MMAP_MODEL_PATH = os.path.join(BASE_DIR, "EnsembleModel.joblib")
+NUMPY_MMAP_DIR = os.path.join(BASE_DIR, "EnsembleModel.arrays")
+# Smaller student model distilled from the ensemble, installed by distill.py
+FAST_MODEL_PATH = os.path.join(BASE_DIR, "FastModel.sav")
+
+# "sklearn" serves the pickled ensemble, "numpy" the array export built by numpy_model.py;
+# the "_mmap" variants map their arrays from disk so processes on a host share them,
+# and "fast" serves the distilled student (cheaper, slightly less accurate)
+MODEL_BACKEND = os.environ.get("CAREER_MODEL_BACKEND", "sklearn_mmap")
+
+# Load the model in the background once a page has rendered; 0 leaves every ML import to the first prediction
+WARM_UP = os.environ.get("CAREER_WARM_UP", "1") != "0"
+
+# A neutral answer vector used to exercise the prediction path once after loading
+WARM_UP_ROW = [[0] * 15]
+
+
+def _joblib_load(path):
+    import joblib
+    return joblib.load(path)
+
+
+def _joblib_mmap_load(path):
+    import joblib
+    # Copy-on-write rather than read-only because libsvm needs writable buffers
+    return joblib.load(path, mmap_mode="c")
+
+
+def _numpy_load(path):
+    from numpy_model import NumpyEnsemble
+    return NumpyEnsemble.load(path)
+
+
+def _numpy_mmap_load(path):
+    from numpy_model import NumpyEnsemble
+    return NumpyEnsemble.load_mmap(path)
+
+
+_BACKENDS = {
+    "sklearn": (MODEL_PATH, _joblib_load),
+    "sklearn_mmap": (MMAP_MODEL_PATH, _joblib_mmap_load),
+    "numpy": (NUMPY_MODEL_PATH, _numpy_load),
+    "numpy_mmap": (NUMPY_MMAP_DIR, _numpy_mmap_load),
+    "fast": (FAST_MODEL_PATH, _joblib_load),
+}
+MODEL_BACKENDS = tuple(_BACKENDS)
+
+
+class ModelProvider:
+    """Loads a model artifact on first use and hands out the shared instance.
+
+    ``version`` names the registry version being served (None for the files
+    next to this module). ``swap`` replaces the model while the process runs;
+    the last few versions stay retained for sessions pinned to them.
+    """
+
+    def __init__(self, path=MODEL_PATH, loader=_joblib_load, backend="sklearn", version=None,
+                 retain=model_registry.RETAIN_VERSIONS):
+        self.path = path
+        self.backend = backend
+        self.version = version
+        self.retain = retain
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._model = None
+        self._retained = OrderedDict()
+        self.loads = 0
+        self.hits = 0
+        self.swaps = 0
+        self.load_seconds = None
+        self.loaded_at = None
+        self.swapped_at = None
+        self.warm_up_seconds = None
+        self._warm_up = None
+        self._warm_up_lock = threading.Lock()
+
+    def get(self, version=None):
+        """The served model, or the retained model of an earlier ``version``"""
+        if version is not None and version != self.version:
+            model = self._retained.get(version)
+            if model is not None:
+                return model
+        with self._lock:
+            if self._model is None:
+                start = time.perf_counter()
+                self._model = self._loader(self.path)
+                self.load_seconds = time.perf_counter() - start
+                self.loaded_at = time.time()
+                self.loads += 1
+            else:
+                self.hits += 1
+            return self._model
+
+    def is_loaded(self):
+        return self._model is not None
+
+    def load(self, path):
+        """Load another artifact with this provider's loader, without serving it"""
+        return self._loader(path)
+
+    def swap(self, model, version, path):
+        """Serve ``model`` from now on, retaining the previous one for pinned sessions"""
+        with self._lock:
+            # Sessions on the unversioned files have nothing to pin to and move on
+            if self._model is not None and self.version is not None:
+                self._retained[self.version] = self._model
+                while len(self._retained) > max(self.retain - 1, 0):
+                    self._retained.popitem(last=False)
+            self._model, self.version, self.path = model, version, path
+            self.swaps += 1
+            self.swapped_at = time.time()
+
+    def resolve(self, version):
+        """``version`` while it is still served or retained, else the active version"""
+        if version == self.version or version in self._retained:
+            return version
+        return self.version
+
+    def _run_warm_up(self):
+        start = time.perf_counter()
+        model = self.get()
+        model.predict(WARM_UP_ROW)
+        import prediction_cache
+        if prediction_cache.SEED_FROM_CSV:
+            prediction_cache.seed_from_csv(model, version=self.version)
+        self.warm_up_seconds = time.perf_counter() - start
+        return model
+
+    def start_warm_up(self):
+        """Load the model and run one dummy prediction on a background thread.
+
+        Safe to call on every rerun: only the first call starts the thread and
+        all callers receive the same future. A caller of ``get`` while the
+        warm-up is still loading simply waits for it on the provider lock.
+        """
+        with self._warm_up_lock:
+            if self._warm_up is None:
+                future = Future()
+
+                def run():
+                    try:
+                        future.set_result(self._run_warm_up())
+                    except BaseException as exc:
+                        future.set_exception(exc)
+
+                threading.Thread(target=run, name="model-warm-up", daemon=True).start()
+                self._warm_up = future
+            return self._warm_up
+
+    def stats(self):
+        return {
+            "backend": self.backend,
+            "version": self.version,
+            "retained_versions": len(self._retained),
+            "path": self.path,
+            "loaded": self.is_loaded(),
+            "loads": self.loads,
+            "hits": self.hits,
+            "load_seconds": self.load_seconds,
+            "loaded_at": self.loaded_at,
+            "swaps": self.swaps,
+            "swapped_at": self.swapped_at,
+            "warm_up_started": self._warm_up is not None,
+            "warm_up_seconds": self.warm_up_seconds,
+        }
+
+
+def create_provider(backend=MODEL_BACKEND, registry=model_registry.REGISTRY_DIR):
+    """Provider for ``backend``, serving the registry's active version if one is published.
+
+    Pass ``registry=None`` to use the files next to this module. The fast model
+    is not versioned.
+    """
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown model backend {backend!r}, expected one of {sorted(_BACKENDS)}")
+    path, loader = _BACKENDS[backend]
+    version = model_registry.current_version(registry) if registry and backend != "fast" else None
+    if version is not None:
+        path = model_registry.artifact_path(version, path, registry)
+    return ModelProvider(path, loader, backend, version)
+
+
+_provider = create_provider()
+# The distilled model, kept to answer when the shared model is too slow
+_fast_provider = _provider if MODEL_BACKEND == "fast" else create_provider("fast")
+
+
+def get_model(version=None):
+    """Return the shared model, loading it on the first call in this process.
+
+    With ``version``, return that version's model while it is still retained
+    (see ``resolve_version``).
+    """
+    return _provider.get(version)
+
+
+def resolve_version(version=None):
+    """The version a session pinned to ``version`` should use: it while retained, else the active one"""
+    return _provider.resolve(version)
+
+
+def get_fast_model():
+    """Return the distilled fast model, loading it on the first call in this process"""
+    return _fast_provider.get()
+
+
+def _seed_new_version(model, version):
+    import prediction_cache
+    if prediction_cache.SEED_FROM_CSV:
+        prediction_cache.seed_from_csv(model, version=version)
+
+
+_watcher = None
+_watcher_lock = threading.Lock()
+
+
+def start_warm_up():
+    """Start loading the shared model in the background if nothing has yet,
+    and watch the model registry for new versions.
+
+    Returns the warm-up future, or None with ``CAREER_WARM_UP=0``.
+    """
+    global _watcher
+    if _watcher is None and model_registry.POLL_SECONDS > 0 and _provider.backend != "fast":
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = model_registry.RegistryWatcher(_provider, on_swap=_seed_new_version).start()
+    return _provider.start_warm_up() if WARM_UP else None
+
+
+def model_stats():
+    return _provider.stats()
+
+
+def registry_stats():
+    return _watcher.stats() if _watcher is not None else {}
+
+
+register_gauges("career_model", model_stats, "Shared model provider statistics.")
+register_gauges("career_model_registry", registry_stats, "Model registry watcher statistics.")
+register_info("career_model_version",
+              lambda: {"backend": _provider.backend, "version": _provider.version or "unversioned"},
+              "Model version served to new sessions.")
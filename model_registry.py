@@ -0,0 +1,334 @@
+"""Versioned model registry that running servers pick up without a restart.
+
+    registry/
+        CURRENT                      # name of the active version
+        golden.npz                   # golden answers and their roles in CleanedData.csv
+        versions/<version>/
+            EnsembleModel.sav        # plus the .npz, .joblib and .arrays exports
+            golden_predictions.npz   # what this version predicted for the golden answers
+            manifest.json
+
+A version is built in a staging directory and renamed into ``versions/`` in one
+step, and ``CURRENT`` is replaced atomically, so readers never see a partial
+version. Every server process runs a ``RegistryWatcher``. When ``CURRENT``
+changes, the watcher loads that version in the background and checks its
+accuracy on the golden set, and only then swaps it into the model provider.
+Sessions that started on the previous version keep it while it is retained
+(see ``model_provider.resolve_version``).
+
+    python model_registry.py publish models/EnsembleModel-<version>.sav
+    python model_registry.py activate <version>   # e.g. roll back
+    python model_registry.py list
+    python model_registry.py golden               # rebuild the golden set from CleanedData.bin
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+
+from instrumentation import observe
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_DIR = os.environ.get("CAREER_MODEL_REGISTRY", os.path.join(BASE_DIR, "registry"))
+# Seconds between checks for a newly activated version; 0 turns the watcher off
+POLL_SECONDS = float(os.environ.get("CAREER_REGISTRY_POLL", "5"))
+# Model versions kept in memory, the active one included, for sessions pinned to them
+RETAIN_VERSIONS = int(os.environ.get("CAREER_REGISTRY_RETAIN", "2"))
+# Share of the golden answers a version must predict the dataset's role for
+GOLDEN_MIN_ACCURACY = float(os.environ.get("CAREER_GOLDEN_MIN_ACCURACY", "0.8"))
+# Most common distinct (answers, role) rows of CleanedData.bin put in a new golden set
+GOLDEN_SIZE = 512
+
+CURRENT_FILE = "CURRENT"
+GOLDEN_FILE = "golden.npz"
+VERSIONS_DIR = "versions"
+EXPECTED_FILE = "golden_predictions.npz"
+MANIFEST_FILE = "manifest.json"
+
+
+class VerificationError(RuntimeError):
+    pass
+
+
+def version_dir(version, registry=REGISTRY_DIR):
+    return os.path.join(registry, VERSIONS_DIR, version)
+
+
+def artifact_path(version, path, registry=REGISTRY_DIR):
+    """Where ``version`` keeps its copy of the artifact at ``path``"""
+    return os.path.join(version_dir(version, registry), os.path.basename(path))
+
+
+def current_version(registry=REGISTRY_DIR):
+    """Name of the active version, or None when nothing has been published"""
+    try:
+        with open(os.path.join(registry, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def activate(version, registry=REGISTRY_DIR):
+    """Make a published version the active one"""
+    if not os.path.isfile(os.path.join(version_dir(version, registry), MANIFEST_FILE)):
+        raise ValueError(f"Version {version!r} is not published in {registry}")
+    path = os.path.join(registry, CURRENT_FILE)
+    staging = f"{path}.tmp{os.getpid()}"
+    with open(staging, "w") as f:
+        f.write(version + "\n")
+    os.replace(staging, path)
+
+
+def versions(registry=REGISTRY_DIR):
+    """Manifests of every published version, oldest first"""
+    root = os.path.join(registry, VERSIONS_DIR)
+    manifests = []
+    for name in sorted(os.listdir(root)) if os.path.isdir(root) else ():
+        path = os.path.join(root, name, MANIFEST_FILE)
+        if not name.startswith(".") and os.path.isfile(path):
+            with open(path) as f:
+                manifests.append(json.load(f))
+    return sorted(manifests, key=lambda m: m["published_at"])
+
+
+def write_golden(registry=REGISTRY_DIR, size=GOLDEN_SIZE):
+    """Record the most common real (answers, role) rows, answers as the page sends them"""
+    import numpy as np
+
+    import dataset
+    from assessment import FEATURE_COLUMNS, model_inputs
+
+    data = dataset.load()
+    rows = data.unique[np.argsort(-np.asarray(data.counts), kind="stable")[:size]]
+    answers = model_inputs(rows[:, [data.columns.index(c) for c in FEATURE_COLUMNS]])
+    os.makedirs(registry, exist_ok=True)
+    path = os.path.join(registry, GOLDEN_FILE)
+    staging = f"{path}.tmp{os.getpid()}"
+    with open(staging, "wb") as f:
+        np.savez(f, answers=answers, roles=rows[:, data.columns.index(dataset.LABEL_COLUMN)])
+    os.replace(staging, path)
+    return len(answers)
+
+
+def load_golden(registry=REGISTRY_DIR):
+    """Golden answers as model input and the role each row has in the dataset"""
+    import numpy as np
+
+    with np.load(os.path.join(registry, GOLDEN_FILE)) as golden:
+        if "roles" not in golden.files:
+            # Earlier golden sets held a model's own predictions on CSV-encoded rows
+            raise VerificationError("The golden set predates dataset roles; rebuild it with "
+                                    "'python model_registry.py golden'")
+        return golden["answers"].astype(np.float64), golden["roles"]
+
+
+def _load_expected(version, registry=REGISTRY_DIR):
+    import numpy as np
+
+    with np.load(os.path.join(version_dir(version, registry), EXPECTED_FILE)) as expected:
+        return expected["answers"].astype(np.float64), expected["labels"]
+
+
+def _accuracy(predicted, roles, min_accuracy):
+    import numpy as np
+
+    accuracy = float(np.mean(predicted == roles))
+    if accuracy < min_accuracy:
+        raise VerificationError(f"Predicts the dataset's role for {accuracy:.1%} of the golden answers, "
+                                f"below the required {min_accuracy:.1%}")
+    return accuracy
+
+
+def verify(model, version, registry=REGISTRY_DIR, min_accuracy=GOLDEN_MIN_ACCURACY):
+    """Check a loaded version against the golden set before it is served.
+
+    The model must reproduce exactly what the version predicted when it was
+    published, which catches damaged or mismatched artifacts, and predict the
+    dataset's role for at least ``min_accuracy`` of the golden answers. Returns
+    that accuracy; raises VerificationError otherwise.
+    """
+    import numpy as np
+
+    answers, expected = _load_expected(version, registry)
+    predicted = np.asarray(model.predict(answers))
+    if not np.array_equal(predicted, expected):
+        raise VerificationError(f"Version {version!r} predicts {int(np.sum(predicted != expected))} golden "
+                                f"answers differently than when it was published")
+    answers, roles = load_golden(registry)
+    return _accuracy(np.asarray(model.predict(answers)), roles, min_accuracy)
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def publish(model_path, version=None, registry=REGISTRY_DIR, make_active=True,
+            min_accuracy=GOLDEN_MIN_ACCURACY):
+    """Add a trained ensemble to the registry with every export the app can serve.
+
+    The first version published also writes the golden set. Returns the manifest.
+    """
+    import numpy as np
+
+    import mmap_model
+    import numpy_model
+    from model_provider import MMAP_MODEL_PATH, MODEL_PATH, NUMPY_MMAP_DIR, NUMPY_MODEL_PATH
+
+    sha256 = _file_sha256(model_path)
+    version = version or time.strftime("%Y%m%d-%H%M%S", time.gmtime()) + "-" + sha256[:8]
+    final = version_dir(version, registry)
+    if os.path.exists(final):
+        raise ValueError(f"Version {version!r} is already published in {registry}")
+    staging = os.path.join(registry, VERSIONS_DIR, f".{version}.tmp{os.getpid()}")
+    os.makedirs(staging)
+    try:
+        saved = os.path.join(staging, os.path.basename(MODEL_PATH))
+        shutil.copyfile(model_path, saved)
+        model = mmap_model.build(saved, os.path.join(staging, os.path.basename(MMAP_MODEL_PATH)),
+                                 os.path.join(staging, os.path.basename(NUMPY_MMAP_DIR)))
+        numpy_model.save(numpy_model.export_ensemble(model),
+                         os.path.join(staging, os.path.basename(NUMPY_MODEL_PATH)))
+        if not os.path.exists(os.path.join(registry, GOLDEN_FILE)):
+            write_golden(registry)
+        answers, roles = load_golden(registry)
+        predicted = np.asarray(model.predict(answers))
+        manifest = {
+            "version": version,
+            "published_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "source": os.path.abspath(model_path),
+            "sha256": sha256,
+            "golden_accuracy": _accuracy(predicted, roles, min_accuracy),
+        }
+        np.savez(os.path.join(staging, EXPECTED_FILE), answers=answers.astype(np.uint8), labels=predicted)
+        with open(os.path.join(staging, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(staging, final)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    if make_active:
+        activate(version, registry)
+    return manifest
+
+
+class RegistryWatcher:
+    """Polls the registry and swaps a model provider onto each newly activated version"""
+
+    def __init__(self, provider, registry=REGISTRY_DIR, interval=POLL_SECONDS, on_swap=None):
+        self.provider = provider
+        self.registry = registry
+        self.interval = interval
+        self._on_swap = on_swap
+        self._thread = None
+        self.checks = 0
+        self.swaps = 0
+        self.failures = 0
+        self.errors = 0
+        self.failed_version = None
+        self.last_error = None
+        self.last_swap_seconds = None
+
+    def check(self):
+        """Swap to the active version if it changed and passes verification.
+
+        Returns whether it swapped. A version that fails is not retried until
+        another one is activated.
+        """
+        self.checks += 1
+        version = current_version(self.registry)
+        if version is None or version in (self.provider.version, self.failed_version):
+            return False
+        start = time.perf_counter()
+        try:
+            path = artifact_path(version, self.provider.path, self.registry)
+            model = self.provider.load(path)
+            verify(model, version, self.registry)
+            self.provider.swap(model, version, path)
+        except Exception as exc:
+            self.failures += 1
+            self.failed_version = version
+            self.last_error = f"{version}: {exc}"
+            return False
+        self.last_swap_seconds = time.perf_counter() - start
+        # Only completed swaps count towards the swap latency
+        observe("model_swap", self.last_swap_seconds)
+        self.swaps += 1
+        self.failed_version = None
+        if self._on_swap is not None:
+            self._on_swap(model, version)
+        return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as exc:
+                # Keep polling, or this process would never swap models again
+                self.errors += 1
+                self.last_error = f"check: {exc}"
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="model-registry-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stats(self):
+        return {
+            "registry": self.registry,
+            "interval_seconds": self.interval,
+            "checks": self.checks,
+            "swaps": self.swaps,
+            "failures": self.failures,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "last_swap_seconds": self.last_swap_seconds,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish and activate versions of the career model")
+    parser.add_argument("--registry", default=REGISTRY_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    publish_parser = sub.add_parser("publish")
+    publish_parser.add_argument("model", help="trained EnsembleModel .sav file")
+    publish_parser.add_argument("--version", help="version name (default <UTC timestamp>-<file hash>)")
+    publish_parser.add_argument("--no-activate", action="store_true", help="publish without serving it")
+    activate_parser = sub.add_parser("activate")
+    activate_parser.add_argument("version")
+    sub.add_parser("list")
+    sub.add_parser("golden")
+    args = parser.parse_args(argv)
+
+    if args.command == "publish":
+        manifest = publish(args.model, args.version, args.registry, make_active=not args.no_activate)
+        print(f"Published {manifest['version']} ({manifest['golden_accuracy']:.1%} golden accuracy)"
+              + ("" if args.no_activate else "; running servers switch to it within "
+                 f"{POLL_SECONDS:g}s"))
+    elif args.command == "activate":
+        activate(args.version, args.registry)
+        print(f"Activated {args.version}")
+    elif args.command == "list":
+        active = current_version(args.registry)
+        for manifest in versions(args.registry):
+            marker = "*" if manifest["version"] == active else " "
+            accuracy = manifest.get("golden_accuracy")
+            print(f"{marker} {manifest['version']}  published {manifest['published_at']}  "
+                  + (f"golden accuracy {accuracy:.1%}" if accuracy is not None else "published before golden roles"))
+    else:
+        count = write_golden(args.registry)
+        print(f"Wrote {count} golden answers with their roles in CleanedData.bin")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
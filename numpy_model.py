@@ -0,0 +1,398 @@
+"""Dependency-free NumPy evaluator for the stacked career prediction ensemble.
+
+``EnsembleModel.sav`` is a scikit-learn ``StackingClassifier`` whose base
+estimators (decision tree, Gaussian naive Bayes, RBF SVC with Platt scaling)
+feed their ``predict_proba`` outputs to a logistic regression. ``build``
+copies the fitted parameters into plain arrays saved as ``EnsembleModel.npz``
+and ``NumpyEnsemble`` reproduces ``predict``/``predict_proba`` from them, so
+serving only needs NumPy.
+
+    python numpy_model.py build     # export and verify against CleanedData.csv
+    python numpy_model.py verify    # re-check an existing export
+"""
+import argparse
+import os
+import shutil
+import sys
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+NUMPY_MODEL_PATH = os.path.join(BASE_DIR, "EnsembleModel.npz")
+FORMAT_VERSION = 1
+
+# libsvm clamps pairwise probabilities to this range before coupling them
+_SVM_MIN_PROB = 1e-7
+
+# Up to this many rows the pairwise coupling runs as a scalar loop, which is
+# both faster than NumPy for tiny inputs and follows libsvm's operation order
+_SCALAR_COUPLING_ROWS = 8
+
+
+def _export_tree(est):
+    tree = est.tree_
+    value = tree.value[:, 0, :]
+    return {
+        "left": tree.children_left.astype(np.int32),
+        "right": tree.children_right.astype(np.int32),
+        "feature": tree.feature.astype(np.int32),
+        "threshold": tree.threshold.astype(np.float64),
+        "value": value.astype(np.float64),
+    }
+
+
+def _export_naive_bayes(est):
+    return {
+        "theta": est.theta_.astype(np.float64),
+        "var": est.var_.astype(np.float64),
+        "class_prior": est.class_prior_.astype(np.float64),
+    }
+
+
+def _export_svc(est):
+    if est.kernel != "rbf":
+        raise ValueError(f"Only RBF SVC estimators can be exported, got kernel={est.kernel!r}")
+    if not est.probability:
+        raise ValueError("The SVC must be fitted with probability=True")
+    return {
+        "support_vectors": est.support_vectors_.astype(np.float64),
+        "dual_coef": est._dual_coef_.astype(np.float64),
+        "n_support": est.n_support_.astype(np.int32),
+        "intercept": est._intercept_.astype(np.float64),
+        "prob_a": est.probA_.astype(np.float64),
+        "prob_b": est.probB_.astype(np.float64),
+        "gamma": np.float64(est._gamma),
+    }
+
+
+_EXPORTERS = {
+    "DecisionTreeClassifier": ("tree", _export_tree),
+    "GaussianNB": ("naive_bayes", _export_naive_bayes),
+    "SVC": ("svc", _export_svc),
+}
+
+
+def export_ensemble(model):
+    """Flatten a fitted StackingClassifier into a dict of NumPy arrays"""
+    if model.stack_method_ and any(m != "predict_proba" for m in model.stack_method_):
+        raise ValueError("Only predict_proba stacking is supported")
+    if model.passthrough:
+        raise ValueError("Stacking with passthrough=True is not supported")
+    if len(model.classes_) <= 2:
+        raise ValueError("Only multi-class ensembles are supported")
+    arrays = {
+        "format_version": np.int32(FORMAT_VERSION),
+        "classes": np.asarray(model.classes_),
+        "final_coef": model.final_estimator_.coef_.astype(np.float64),
+        "final_intercept": model.final_estimator_.intercept_.astype(np.float64),
+    }
+    kinds = []
+    for index, est in enumerate(model.estimators_):
+        name = type(est).__name__
+        if name not in _EXPORTERS:
+            raise ValueError(f"No NumPy exporter for base estimator {name}")
+        kind, exporter = _EXPORTERS[name]
+        kinds.append(kind)
+        for key, value in exporter(est).items():
+            arrays[f"est{index}_{key}"] = value
+    arrays["estimator_kinds"] = np.array(kinds)
+    return arrays
+
+
+def _tree_proba(p, X):
+    # Trees compare float32 features against float64 thresholds
+    X = X.astype(np.float32).astype(np.float64)
+    left, right, feature, threshold = p["left"], p["right"], p["feature"], p["threshold"]
+    rows = np.arange(len(X))
+    node = np.zeros(len(X), dtype=np.int64)
+    internal = left[node] != -1
+    while internal.any():
+        n = node[internal]
+        go_left = X[rows[internal], feature[n]] <= threshold[n]
+        node[internal] = np.where(go_left, left[n], right[n])
+        internal = left[node] != -1
+    proba = p["value"][node]
+    normalizer = proba.sum(axis=1)
+    normalizer[normalizer == 0.0] = 1.0
+    return proba / normalizer[:, np.newaxis]
+
+
+def _prepare_naive_bayes(p):
+    if "log_norm" not in p:
+        p["log_norm"] = -0.5 * np.sum(np.log(2.0 * np.pi * p["var"]), axis=1)
+        p["log_prior"] = np.log(p["class_prior"])
+    return p
+
+
+def _naive_bayes_proba(p, X):
+    n_ij = p["log_norm"] - 0.5 * np.sum(((X[:, np.newaxis, :] - p["theta"]) ** 2) / p["var"], 2)
+    jll = p["log_prior"] + n_ij
+    a_max = jll.max(axis=1, keepdims=True)
+    log_prob_x = np.log(np.sum(np.exp(jll - a_max), axis=1, keepdims=True)) + a_max
+    return np.exp(jll - log_prob_x)
+
+
+def _prepare_svc(p):
+    n_support = p["n_support"]
+    k = len(n_support)
+    bounds = np.concatenate([[0], np.cumsum(n_support)])
+    # libsvm scores the pair (i, j) with the class-i support vectors weighted by
+    # row j-1 of the dual coefficients plus the class-j ones weighted by row i.
+    # One small matmul per class gives every such partial sum at once.
+    if "dual_coef_t" not in p:
+        p["dual_coef_t"] = np.ascontiguousarray(p["dual_coef"].T)
+        p["sv_sq_norms"] = (p["support_vectors"] ** 2).sum(axis=1)
+    p["blocks"] = [(bounds[c], bounds[c + 1], p["dual_coef_t"][bounds[c]:bounds[c + 1]]) for c in range(k)]
+    i, j = np.triu_indices(k, 1)
+    p["pair_i"], p["pair_j"] = i, j
+    return p
+
+
+def _couple_pairwise_row(r):
+    """Scalar port of libsvm's multiclass_probability for one row"""
+    k = len(r)
+    Q = [[0.0] * k for _ in range(k)]
+    for t in range(k):
+        for j in range(t):
+            Q[t][t] += r[j][t] * r[j][t]
+            Q[t][j] = Q[j][t]
+        for j in range(t + 1, k):
+            Q[t][t] += r[j][t] * r[j][t]
+            Q[t][j] = -r[j][t] * r[t][j]
+    p = [1.0 / k] * k
+    Qp = [0.0] * k
+    eps = 0.005 / k
+    for _ in range(max(100, k)):
+        pQp = 0.0
+        for t in range(k):
+            acc = 0.0
+            row = Q[t]
+            for j in range(k):
+                acc += row[j] * p[j]
+            Qp[t] = acc
+            pQp += p[t] * acc
+        if max(abs(q - pQp) for q in Qp) < eps:
+            break
+        for t in range(k):
+            diff = (-Qp[t] + pQp) / Q[t][t]
+            p[t] += diff
+            scale = 1.0 + diff
+            pQp = (pQp + diff * (diff * Q[t][t] + 2 * Qp[t])) / scale / scale
+            row = Q[t]
+            for j in range(k):
+                Qp[j] = (Qp[j] + diff * row[j]) / scale
+                p[j] /= scale
+    return p
+
+
+def _couple_pairwise(r):
+    """Vectorized port of libsvm's multiclass_probability (Wu, Lin and Weng)"""
+    n, k = r.shape[0], r.shape[1]
+    Q = -r.transpose(0, 2, 1) * r
+    diag = np.einsum("nji,nji->ni", r, r) - np.einsum("nii,nii->ni", r, r)
+    idx = np.arange(k)
+    Q[:, idx, idx] = diag
+    p = np.full((n, k), 1.0 / k)
+    eps = 0.005 / k
+    active = np.ones(n, dtype=bool)
+    for _ in range(max(100, k)):
+        a = np.flatnonzero(active)
+        if not len(a):
+            break
+        Qa, pa = Q[a], p[a]
+        Qp = np.einsum("nij,nj->ni", Qa, pa)
+        pQp = np.einsum("ni,ni->n", pa, Qp)
+        converged = np.abs(Qp - pQp[:, np.newaxis]).max(axis=1) < eps
+        active[a[converged]] = False
+        todo = ~converged
+        Qa, pa, Qp, pQp = Qa[todo], pa[todo], Qp[todo], pQp[todo]
+        for t in range(k):
+            diff = (-Qp[:, t] + pQp) / Qa[:, t, t]
+            pa[:, t] += diff
+            scale = 1.0 + diff
+            pQp = (pQp + diff * (diff * Qa[:, t, t] + 2.0 * Qp[:, t])) / scale / scale
+            Qp = (Qp + diff[:, np.newaxis] * Qa[:, t, :]) / scale[:, np.newaxis]
+            pa /= scale[:, np.newaxis]
+        p[a[todo]] = pa
+    return p
+
+
+def _svc_proba(p, X):
+    sq_dist = (X * X).sum(axis=1)[:, np.newaxis] + p["sv_sq_norms"] - 2.0 * X @ p["support_vectors"].T
+    kernel = np.exp(-p["gamma"] * np.maximum(sq_dist, 0.0))
+    partial = np.stack([kernel[:, start:stop] @ coef for start, stop, coef in p["blocks"]], axis=2)
+    i, j = p["pair_i"], p["pair_j"]
+    dec = partial[:, j - 1, i] + partial[:, i, j] + p["intercept"]
+    f_apb = dec * p["prob_a"] + p["prob_b"]
+    with np.errstate(over="ignore", invalid="ignore"):
+        pairwise = np.where(f_apb >= 0, np.exp(-f_apb) / (1.0 + np.exp(-f_apb)), 1.0 / (1.0 + np.exp(f_apb)))
+    pairwise = np.clip(pairwise, _SVM_MIN_PROB, 1.0 - _SVM_MIN_PROB)
+    k = len(p["n_support"])
+    r = np.zeros((len(X), k, k))
+    r[:, i, j] = pairwise
+    r[:, j, i] = 1.0 - pairwise
+    if len(X) <= _SCALAR_COUPLING_ROWS:
+        return np.array([_couple_pairwise_row(row.tolist()) for row in r]).reshape(len(X), k)
+    return _couple_pairwise(r)
+
+
+_EVALUATORS = {
+    "tree": _tree_proba,
+    "naive_bayes": _naive_bayes_proba,
+    "svc": _svc_proba,
+}
+
+# Derived arrays that are cheaper to rebuild at load time than to store
+_PREPARERS = {
+    "naive_bayes": _prepare_naive_bayes,
+    "svc": _prepare_svc,
+}
+
+# Derived arrays kept in the memory-mapped layout, so that loading it copies nothing
+_DERIVED = {
+    "naive_bayes": ("log_norm", "log_prior"),
+    "svc": ("dual_coef_t", "sv_sq_norms"),
+}
+
+
+class NumpyEnsemble:
+    """Array-based stand-in for the pickled ensemble's predict/predict_proba"""
+
+    def __init__(self, arrays):
+        if int(arrays["format_version"]) != FORMAT_VERSION:
+            raise ValueError(f"Unsupported NumPy model format {int(arrays['format_version'])}")
+        self.classes_ = arrays["classes"]
+        self._final_coef = arrays["final_coef"]
+        self._final_intercept = arrays["final_intercept"]
+        self._estimators = []
+        for index, kind in enumerate(arrays["estimator_kinds"]):
+            prefix = f"est{index}_"
+            params = {key[len(prefix):]: arrays[key] for key in arrays if key.startswith(prefix)}
+            kind = str(kind)
+            if kind in _PREPARERS:
+                params = _PREPARERS[kind](params)
+            self._estimators.append((_EVALUATORS[kind], params))
+
+    @classmethod
+    def load(cls, path=NUMPY_MODEL_PATH):
+        with np.load(path) as data:
+            return cls({key: data[key] for key in data.files})
+
+    @classmethod
+    def load_mmap(cls, directory):
+        """Open a directory written by ``save_dir`` with every array memory-mapped read-only"""
+        return cls(load_dir(directory))
+
+    def _decision_function(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        stacked = np.hstack([evaluate(params, X) for evaluate, params in self._estimators])
+        return stacked @ self._final_coef.T + self._final_intercept
+
+    def predict_proba(self, X):
+        scores = self._decision_function(X)
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, X):
+        return self.classes_[self._decision_function(X).argmax(axis=1)]
+
+
+def save(arrays, path=NUMPY_MODEL_PATH):
+    np.savez(path, **arrays)
+
+
+def with_derived(arrays):
+    """Return the exported arrays plus the derived ones the evaluators would compute"""
+    arrays = dict(arrays)
+    for index, kind in enumerate(arrays["estimator_kinds"]):
+        kind = str(kind)
+        if kind not in _DERIVED:
+            continue
+        prefix = f"est{index}_"
+        params = _PREPARERS[kind]({key[len(prefix):]: arrays[key] for key in arrays if key.startswith(prefix)})
+        for key in _DERIVED[kind]:
+            arrays[prefix + key] = params[key]
+    return arrays
+
+
+def save_dir(arrays, directory):
+    """Write one .npy file per array, replacing ``directory`` atomically"""
+    directory = os.path.abspath(directory)
+    staging = f"{directory}.tmp{os.getpid()}"
+    os.makedirs(staging)
+    for key, value in arrays.items():
+        np.save(os.path.join(staging, f"{key}.npy"), value, allow_pickle=False)
+    replace_dir(staging, directory)
+
+
+def replace_dir(staging, directory):
+    """Move the directory ``staging`` to ``directory``, replacing any previous one"""
+    if os.path.isdir(directory):
+        previous = f"{directory}.old{os.getpid()}"
+        os.rename(directory, previous)
+        os.rename(staging, directory)
+        shutil.rmtree(previous)
+    else:
+        os.rename(staging, directory)
+
+
+def load_dir(directory, mmap_mode="r"):
+    arrays = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".npy"):
+            # asarray drops the np.memmap subclass; the view still keeps the mapping open
+            data = np.load(os.path.join(directory, name), mmap_mode=mmap_mode, allow_pickle=False)
+            arrays[name[:-len(".npy")]] = np.asarray(data) if data.ndim else data[()]
+    return arrays
+
+
+def load_features(csv_path):
+    """Read the 15 skill columns of CleanedData.csv as a float64 matrix"""
+    data = np.loadtxt(csv_path, delimiter=",", skiprows=1, dtype=np.float64)
+    return data[:, :-1]
+
+
+def verify(engine, model, X):
+    """Compare the NumPy engine against the reference model on every row of X"""
+    expected = np.asarray(model.predict(X))
+    actual = engine.predict(X)
+    mismatches = int(np.count_nonzero(expected != actual))
+    proba_error = float(np.abs(model.predict_proba(X) - engine.predict_proba(X)).max())
+    return {"rows": len(X), "mismatches": mismatches, "max_proba_error": proba_error}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument("--model", default=os.path.join(BASE_DIR, "EnsembleModel.sav"))
+    parser.add_argument("--data", default=os.path.join(BASE_DIR, "CleanedData.csv"))
+    parser.add_argument("--out", default=NUMPY_MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    import joblib
+    model = joblib.load(args.model)
+    X = load_features(args.data)
+    if args.command == "build":
+        arrays = export_ensemble(model)
+        engine = NumpyEnsemble(arrays)
+    else:
+        engine = NumpyEnsemble.load(args.out)
+
+    report = verify(engine, model, X)
+    print(f"Checked {report['rows']} rows: {report['mismatches']} label mismatches, "
+          f"max probability difference {report['max_proba_error']:.3g}")
+    if report["mismatches"]:
+        print("NumPy engine disagrees with the reference model", file=sys.stderr)
+        return 1
+    if args.command == "build":
+        save(arrays, args.out)
+        print(f"Wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
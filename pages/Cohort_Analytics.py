@@ -0,0 +1,73 @@
+#IMPORT STATEMENTS
+import altair as alt
+import pandas as pd
+import streamlit as st
+from assessment import Category_mapping, FEATURE_COLUMNS
+from cohort_analytics import DASHBOARD, load_cohort, professionals, shared_recorder
+from instrumentation import timer
+
+ROLE_NAMES = [Category_mapping[label] for label in range(len(Category_mapping))]
+
+#Page configuration
+st.set_page_config(
+    page_title="Cohort Analytics |  Career Advisor",
+    page_icon="📊",
+    layout="wide"
+)
+
+if st.button("← Back to Home", key="home_button"):
+    st.switch_page("Homepage.py")
+
+def show_summary(cohort):
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Students scored", f"{cohort.total:,}")
+    col2.metric("Roles predicted", int((cohort.role_counts > 0).sum()))
+    col3.metric("Most common role", ROLE_NAMES[int(cohort.role_counts.argmax())])
+
+def show_role_distribution(cohort):
+    st.subheader("Role Distribution")
+    counts = pd.DataFrame({"Students": cohort.role_counts}, index=ROLE_NAMES)
+    st.bar_chart(counts[cohort.role_counts > 0])
+
+def show_skill_profiles(cohort):
+    st.subheader("Average Skill Profile per Predicted Role")
+    st.caption("Mean self-rating from 0 (Not Interested) to 6 (Professional).")
+    means = pd.DataFrame(cohort.skill_means(), index=ROLE_NAMES, columns=FEATURE_COLUMNS)
+    st.dataframe(means[cohort.role_counts > 0].round(2))
+
+def show_skill_gaps(cohort):
+    st.subheader("Skill Gaps Against Professionals in the Same Role")
+    st.caption("Students' mean rating minus that of the professionals in our data with the role. "
+               "Red cells are skills where students rate themselves lower.")
+    gaps = pd.DataFrame(cohort.skill_gaps(professionals()), index=ROLE_NAMES, columns=FEATURE_COLUMNS)
+    cells = gaps[cohort.role_counts > 0].reset_index(names="Role").melt(
+        id_vars="Role", var_name="Skill", value_name="Gap")
+    chart = alt.Chart(cells).mark_rect().encode(
+        x=alt.X("Skill:N", sort=FEATURE_COLUMNS),
+        y=alt.Y("Role:N"),
+        color=alt.Color("Gap:Q", scale=alt.Scale(scheme="redblue", domainMid=0)),
+        tooltip=["Role", "Skill", alt.Tooltip("Gap:Q", format="+.2f")],
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+#The main function which runs when the file is executed
+def main():
+    st.markdown("<h1>📊 Cohort Analytics</h1>", unsafe_allow_html=True)
+    # Every page under pages/ is listed in each student's sidebar, so the cohort-wide
+    # aggregates are only shown on servers the career office runs with CAREER_COHORT_DASHBOARD=1
+    if not DASHBOARD:
+        st.info("Cohort analytics are only available to career office staff.")
+        return
+    # Built from running aggregates, so this costs the same however many students were scored
+    with timer("cohort_analytics"):
+        cohort = load_cohort(live=shared_recorder)
+    if not cohort.total:
+        st.info("No students have been scored yet. Results appear here as assessments are submitted.")
+        return
+    show_summary(cohort)
+    show_role_distribution(cohort)
+    show_skill_profiles(cohort)
+    show_skill_gaps(cohort)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,28 @@
 #IMPORT STATEMENTS
+import time
+
 import streamlit as st
-import joblib
+from assessment import level_names, options, questions, skill_areas
+from assessment_content import PAGE_CSS, role_sections
+from cohort_analytics import record_scored, recorder_stats
+from inference_pool import SOURCE_CACHE, SOURCE_FAST, predict_ranking, shared_pool
+from instrumentation import DEBUG_PANEL, export_prometheus, stage_summaries, timer
+from model_provider import get_model, model_stats, registry_stats, resolve_version, start_warm_up
+from prediction_cache import answers_key, shared_cache
+from ranking import role_name
+from session_record import (explanation, feature_answers, mapped_answers, pack_ranking, pack_responses, response_pairs,
+                            unpack_ranking)
+from similar_profiles import get_index
+from submission_log import log_submission, submission_log_stats
+from what_if import role_changes, what_if
 
-model = joblib.load('EnsembleModel.sav')
+# How many runner-up careers the results page lists under the prediction
+RUNNER_UPS = 3
+# How many role-changing answer changes the what-if section lists
+WHAT_IF_SHOWN = 3
+# How many of the closest professionals in CleanedData.csv to compare against, and how many roles to list
+SIMILAR_PROFILES = 25
+SIMILAR_ROLES_SHOWN = 4
 
 #Page configuration
 st.set_page_config(
@@ -15,220 +35,7 @@ if st.button("← Back to Home", key="home_button"):
     st.switch_page("Homepage.py")
     
 # Custom CSS
-st.markdown("""
-    <style>
-    /* Base styles */
-    .main {
-        padding: 10px;
-    }
-    
-    /* Form styling - works in both dark and light modes */
-    .stForm {
-        background-color: rgba(100, 100, 100, 0.1); /* Subtle background that works in both themes */
-        padding: 15px;
-        border-radius: 10px;
-        box-shadow: 0 3px 6px rgba(0,0,0,0.15);
-        border: 1px solid rgba(150, 150, 150, 0.2); /* Subtle border for both themes */
-    }
-    
-    /* Question group styling */
-    .question-group {
-        padding: 15px;
-        margin: 10px 0;
-        border-bottom: 2px solid rgba(150, 150, 150, 0.3); /* Works in both themes */
-        background-color: rgba(100, 100, 100, 0.05); /* Very subtle background */
-    }
-    
-    /* Add a slight top border as well except for the first question */
-    .question-group:not(:first-child) {
-        border-top: 1px solid rgba(150, 150, 150, 0.2);
-    }
-    
-    /* Make the last question's bottom border visible */
-    .question-group:last-child {
-        border-bottom: 2px solid rgba(150, 150, 150, 0.3);
-    }
-    
-    /* Text colors and spacing - use !important sparingly */
-    h1 {
-        text-align: center;
-        padding-bottom: 15px;
-        font-size: calc(1.5rem + 1vw) !important;
-    }
-    
-    h2 {
-        margin-bottom: 15px;
-        font-size: calc(1.2rem + 0.5vw) !important;
-    }
-    
-    h5 {
-        font-size: calc(0.9rem + 0.3vw) !important;
-        margin-bottom: 5px !important;
-        font-weight: 600;
-    }
-    
-    /* Radio button styling */
-    .stRadio {
-        margin-bottom: 20px;
-    }
-    
-    .stRadio > label {
-        padding: 8px;
-        border-radius: 5px;
-        font-size: calc(0.8rem + 0.2vw) !important;
-        font-weight: 500;
-    }
-    
-    /* Radio button styles that work in both themes */
-    .stRadio > div {
-        background-color: rgba(100, 100, 100, 0.05);
-        border-radius: 5px;
-        padding: 3px;
-    }
-    
-    /* Mobile adjustments */
-    @media (max-width: 768px) {
-        .question-group {
-            padding: 12px;
-            margin-bottom: 12px;
-            border-radius: 6px;
-            border: 1px solid rgba(150, 150, 150, 0.3);
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }
-        
-        /* Make text bolder on mobile */
-        h5 {
-            font-weight: 600;
-        }
-        
-        /* Make form more visible */
-        .stForm {
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-            border: 1px solid rgba(150, 150, 150, 0.3);
-        }
-    }
-    
-    /* Error message styling */
-    .error-message {
-        color: #ff5252;
-        background-color: rgba(255, 0, 0, 0.1);
-        padding: 10px;
-        border-radius: 5px;
-        margin-top: 10px;
-        margin-bottom: 20px;
-        text-align: center;
-        font-weight: bold;
-        border: 1px solid rgba(255, 0, 0, 0.2);
-    }
-    
-    /* Results page styling for boxes that work in both themes */
-    .result-box {
-        background-color: rgba(100, 100, 100, 0.05);
-        padding: 20px;
-        border-radius: 10px;
-        margin-bottom: 30px;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        border: 1px solid rgba(150, 150, 150, 0.2);
-    }
-    
-    /* Highlight box for the main result */
-    .highlight-box {
-        padding: 30px;
-        border-radius: 10px;
-        text-align: center;
-        margin-bottom: 30px;
-        border: 1px solid rgba(100, 150, 200, 0.3);
-        background-color: rgba(100, 150, 200, 0.1);
-    }
-    </style>
-    """, unsafe_allow_html=True)
-
-# Maps predictions from the ML model to the corresponding field of interest
-Category_mapping = {
-    6: 'Database Administrator', 8: 'Hardware Engineer',
-    2: 'Application Support Engineer', 5: 'Cyber Security Specialist',
-    11: 'Networking Engineer', 13: 'Software Developer',
-    1: 'API Specialist', 12: 'Project Manager',
-    10: 'Information Security Specialist', 15: 'Technical Writer',
-    0: 'AI ML Specialist', 14: 'Software tester',
-    3: 'Business Analyst', 4: 'Customer Service Executive',
-    9: 'Helpdesk Engineer', 7: 'Graphics Designer'
-}
-
-#A list of questions to be asked on the form
-questions = [
-    "What is your level of expertise in database design, SQL, and data management principles?",
-    "How proficient are you in understanding CPU architecture, memory systems, and hardware components?",
-    "Rate your experience with implementing and managing distributed systems and parallel processing.",
-    "How skilled are you in network protocols, configuration, and troubleshooting?",
-    "Rate your ability to conduct digital investigations and recover electronic evidence.",
-    "What is your proficiency level in implementing cybersecurity measures and threat detection?",
-    "How experienced are you in developing and deploying software applications?",
-    "Rate your proficiency in writing efficient code across multiple programming languages.",
-    "How experienced are you in leading technical projects and managing development teams?",
-    "Rate your ability to explain complex technical concepts to diverse audiences.",
-    "What is your skill level in developing and implementing machine learning models?",
-    "How proficient are you in software design patterns and development methodologies?",
-    "Rate your expertise in statistical analysis and data visualization techniques.",
-    "How skilled are you in identifying and resolving complex technical issues?",
-    "What is your proficiency level in creating professional digital designs and graphics?"
-]
-
-options = ["Not Interested", "Poor", "Beginner", "Average", "Intermediate", "Excellent", "Professional"]
-
-# Dictionary mapping skill areas to job roles for explanation purposes
-skill_to_job_mapping = {
-    "database design, SQL, and data management": ["Database Administrator", "Business Analyst"],
-    "CPU architecture, memory systems, and hardware components": ["Hardware Engineer", "Networking Engineer"],
-    "distributed systems and parallel processing": ["AI ML Specialist", "Software Developer"],
-    "network protocols, configuration, and troubleshooting": ["Networking Engineer", "Cyber Security Specialist"],
-    "digital investigations and recover electronic evidence": ["Cyber Security Specialist", "Information Security Specialist"],
-    "cybersecurity measures and threat detection": ["Cyber Security Specialist", "Information Security Specialist"],
-    "developing and deploying software applications": ["Software Developer", "API Specialist"],
-    "writing efficient code across multiple programming languages": ["Software Developer", "AI ML Specialist"],
-    "leading technical projects and managing development teams": ["Project Manager", "Business Analyst"],
-    "explain complex technical concepts to diverse audiences": ["Technical Writer", "Business Analyst"],
-    "developing and implementing machine learning models": ["AI ML Specialist", "Software Developer"],
-    "software design patterns and development methodologies": ["Software Developer", "Project Manager"],
-    "statistical analysis and data visualization techniques": ["Business Analyst", "AI ML Specialist"],
-    "identifying and resolving complex technical issues": ["Application Support Engineer", "Helpdesk Engineer"],
-    "creating professional digital designs and graphics": ["Graphics Designer", "Technical Writer"]
-}
-
-# Job descriptions for each role
-job_descriptions = {
-    'Database Administrator': "Database Administrators organize, store, and protect data using specialized software. They ensure databases operate efficiently, maintain data integrity, back up systems, and implement security measures. They also optimize database performance, troubleshoot issues, and ensure data accessibility while maintaining security protocols.",
-    
-    'Hardware Engineer': "Hardware Engineers design, develop, and test computer systems and components. They create specifications for computer equipment, design hardware components like circuit boards, processors, and memory devices, and test prototypes. They also oversee manufacturing processes and collaborate with software developers to ensure compatibility.",
-    
-    'Application Support Engineer': "Application Support Engineers maintain and troubleshoot software applications. They respond to user issues, implement software updates, perform regular maintenance, and collaborate with development teams to improve application performance. They also document solutions, train users, and contribute to continuous improvement initiatives.",
-    
-    'Cyber Security Specialist': "Cyber Security Specialists protect computer systems and networks from threats. They implement security measures, monitor for breaches, conduct risk assessments, and develop security protocols. They also stay updated on emerging threats, respond to security incidents, and ensure compliance with security policies and regulations.",
-    
-    'Networking Engineer': "Networking Engineers design, implement, and manage computer networks. They configure networking hardware like routers and switches, troubleshoot connectivity issues, implement security protocols, and optimize network performance. They also plan network upgrades, maintain documentation, and ensure network reliability and security.",
-    
-    'Software Developer': "Software Developers design, code, and test software applications. They analyze user requirements, write clean and efficient code, debug programs, and implement software updates. They also collaborate with other developers, document code, and stay current with programming languages and development methodologies.",
-    
-    'API Specialist': "API Specialists develop and maintain Application Programming Interfaces that allow different software systems to communicate. They design API architectures, implement integration solutions, ensure data security during transfers, and document API functionalities. They also troubleshoot integration issues and optimize API performance.",
-    
-    'Project Manager': "Project Managers plan, execute, and close technology projects. They define project scope, create timelines, allocate resources, and coordinate team members. They also track progress, manage risks, communicate with stakeholders, and ensure project deliverables meet requirements within time and budget constraints.",
-    
-    'Information Security Specialist': "Information Security Specialists establish and enforce policies to protect digital information. They assess security risks, implement protection systems, monitor for security breaches, and respond to incidents. They also educate users about security practices, stay updated on emerging threats, and ensure regulatory compliance.",
-    
-    'Technical Writer': "Technical Writers create clear documentation for technology products and services. They develop user manuals, online help systems, tutorials, and reference guides. They also collaborate with subject matter experts, organize information logically, adhere to documentation standards, and ensure materials are accessible to the target audience.",
-    
-    'AI ML Specialist': "AI/ML Specialists develop algorithms and systems that enable machines to learn from data and make decisions. They design and implement machine learning models, prepare and analyze data sets, train algorithms, and evaluate model performance. They also collaborate with teams to integrate AI solutions into applications and continuously improve model accuracy.",
-    
-    'Software tester': "Software Testers evaluate applications to ensure quality and identify defects. They design and execute test cases, perform various testing types (functional, regression, performance), document bugs, and verify fixes. They also develop automated test scripts, participate in quality assurance processes, and help ensure software meets requirements.",
-    
-    'Business Analyst': "Business Analysts bridge the gap between IT and business needs. They gather and document requirements, analyze business processes, recommend solutions, and communicate between stakeholders and development teams. They also create functional specifications, validate deliverables against requirements, and support system implementation.",
-    
-    'Customer Service Executive': "Customer Service Executives in tech support users with product issues and inquiries. They troubleshoot technical problems, provide guidance on product features, manage customer accounts, and escalate complex issues. They also gather customer feedback, maintain service records, and contribute to improving customer experience.",
-    
-    'Helpdesk Engineer': "Helpdesk Engineers provide technical support to resolve user issues. They diagnose and troubleshoot hardware and software problems, perform basic repairs, set up user accounts, and provide technical guidance. They also document solutions, track support tickets, and identify recurring issues for permanent resolution.",
-    
-    'Graphics Designer': "Graphics Designers in tech create visual elements for digital products and interfaces. They design user interfaces, create illustrations and icons, develop brand visual identities, and produce graphics for websites and applications. They also collaborate with product teams, incorporate user feedback, and ensure designs enhance user experience."
-}
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 #A function to reset the form after each click
 def reset_form():
@@ -236,25 +43,6 @@ def reset_form():
         if f"question_{i}" in st.session_state:
             del st.session_state[f"question_{i}"]
 
-#A dataset that maps the input from the form to integers which can be passed into the model
-def mapping(answer):
-    """Map questionnaire responses to numerical values"""
-    if answer == "Not Interested":
-        return 0
-    elif answer == "Poor":
-        return 1
-    elif answer == "Beginner":
-        return 2
-    elif answer == "Average":
-        return 3
-    elif answer == "Intermediate":
-        return 3
-    elif answer == "Excellent":
-        return 4
-    elif answer == "Professional":
-        return 5
-    return 0
-
 # Function to validate responses
 def validate_responses(responses):
     # Check if all responses are "Not Interested"
@@ -262,61 +50,67 @@ def validate_responses(responses):
         return False, "Please express interest in at least one skill area to get accurate career recommendations."
     return True, ""
 
-# Function to generate explanation for prediction
-def generate_explanation(responses):
-    # Find highest-rated skills (excluding "Not Interested")
-    numeric_responses = {q: mapping(r) for q, r in responses.items()}
-    # Filter out "Not Interested" responses (which map to 0)
-    interested_skills = {q: score for q, score in numeric_responses.items() if score > 0}
-    
-    # If no interested skills, provide a generic explanation
-    if not interested_skills:
-        return "Based on your overall pattern of responses, our model has identified this career path as potentially suitable. Consider exploring this field to see if it aligns with your interests and goals."
-    
-    # Sort by score
-    sorted_skills = sorted(interested_skills.items(), key=lambda x: x[1], reverse=True)
-    # Get top 3 or all if less than 3
-    top_skills = sorted_skills[:min(3, len(sorted_skills))]
-    
-    # Generate explanation
-    explanation = "Based on your assessment, you demonstrated interest or proficiency in:"
-    
-    for question, score in top_skills:
-        # Extract key skill area from the question
-        for skill_area, roles in skill_to_job_mapping.items():
-            if skill_area in question.lower():
-                # Convert score back to option text (Poor, Beginner, etc.)
-                rating = options[score]  # This will get the corresponding skill level
-                explanation += f"\n• {skill_area.title()} (rated as '{rating}')"
-                break
-    
-    explanation += "\n\nThese skills are particularly valuable for a " + st.session_state.predicted_role + "."
-    return explanation
-
 # Function to save user responses for the results page
-def save_user_responses(responses):
+def save_user_responses(user_responses):
+    started = time.perf_counter()
     # Convert to numeric values for prediction
-    answer_list = [mapping(responses[q]) for q in questions]
-    
-    # Store in session state for the results page
-    st.session_state.user_responses = responses
-    st.session_state.numeric_responses = answer_list
-    
-    # Get prediction using the pre-loaded model
-    prediction = model.predict([answer_list])
-    st.session_state.prediction = prediction[0]
-    st.session_state.predicted_role = Category_mapping.get(prediction[0], "Unknown Role")
-    
-    # Generate explanation for the prediction
-    st.session_state.explanation = generate_explanation(responses)
+    with timer("mapping"):
+        answers = pack_responses(user_responses)
+        answer_list = mapped_answers(answers)
+    
+    # Session state keeps packed values only; the results page derives the texts it shows
+    # (see session_record). Idle sessions on the results page then cost a few hundred bytes
+    st.session_state.answers = answers
+    
+    # A session keeps the model version it started on, even if a new one is published meanwhile
+    version = resolve_version(st.session_state.get("model_version"))
+    st.session_state.model_version = version
+    
+    # Answer patterns seen before (by any session on this version) skip model inference entirely
+    ranking = shared_cache.get(answers_key(answer_list, version))
+    source = None
+    if ranking is None:
+        # Rank every role with the shared model on the inference pool; if it is
+        # too slow, a cached or fast-model ranking stands in. The top entry is the prediction
+        with st.spinner("Analysing your answers..."):
+            ranking, source = predict_ranking(answer_list, version)
+    prediction = ranking[0][0]
+    st.session_state.prediction_source = source
+    st.session_state.prediction = prediction
+    st.session_state.ranking = pack_ranking(ranking)
+    # The version behind this prediction; unlike model_version it never moves on
+    st.session_state.prediction_version = version
+    # Queued in memory only; a background thread writes it to the submission log
+    log_submission(answer_list, prediction, version, time.perf_counter() - started, source or SOURCE_CACHE)
+    record_scored(feature_answers(answers), prediction)
 
 #The main function which runs when the file is executed
 def main():
     # Check if we're on the results page
     if 'show_results' in st.session_state and st.session_state.show_results:
-        show_results_page()
+        with timer("render_results"):
+            show_results_page()
     else:
         show_assessment_page()
+    if DEBUG_PANEL:
+        show_debug_panel()
+
+def show_debug_panel():
+    # Admin-only view of the submit path timings, enabled with CAREER_DEBUG_PANEL=1
+    with st.sidebar.expander("🛠️ Performance metrics"):
+        rows = [
+            {"Stage": stage, "Count": summary["count"],
+             **{f"{key} (ms)": round(summary[key] * 1000, 3) for key in ("mean", "p50", "p95", "p99")}}
+            for stage, summary in stage_summaries().items() if summary["count"]
+        ]
+        if rows:
+            st.table(rows)
+        else:
+            st.caption("No submissions timed yet.")
+        st.json({"model": model_stats(), "model_registry": registry_stats(),
+                 "prediction_cache": shared_cache.stats(), "inference_pool": shared_pool.stats(),
+                 "submission_log": submission_log_stats(), "cohort_analytics": recorder_stats()})
+        st.code(export_prometheus(), language="text")
 
 def show_assessment_page():
     st.markdown("<h1>🧭 Career Path Predictor</h1>", unsafe_allow_html=True)
@@ -359,10 +153,11 @@ def show_assessment_page():
            
            #Create a radio button format with the options
            response = st.radio(
-               "",
+               question,
                options,
                key=f"question_{i}",
-               horizontal=True
+               horizontal=True,
+               label_visibility="collapsed"
            )
            responses[question] = response
 
@@ -376,7 +171,8 @@ def show_assessment_page():
            
     # When the submit button is pressed, validate responses before proceeding
     if submitted:
-        valid, error_message = validate_responses(responses)
+        with timer("validate"):
+            valid, error_message = validate_responses(responses)
         if valid:
             # Clear any previous error message
             st.session_state.error_message = ""
@@ -396,97 +192,157 @@ def show_assessment_page():
     """, unsafe_allow_html=True)
 
 def show_results_page():
+    prediction = st.session_state.prediction
+    predicted_role = role_name(prediction)
+    ranking = unpack_ranking(st.session_state.ranking)
+    # Role-specific sections are prerendered once per process in assessment_content
+    sections = role_sections(predicted_role)
     st.markdown("<h1>🎯 Your Career Path Results</h1>", unsafe_allow_html=True)
     
     # Display prediction with some animation
     st.markdown(f"""
         <div class="highlight-box">
             <h2>Your Predicted Career Path</h2>
-            <h3 style='font-size: 2.5rem; margin: 20px 0;'>🎉 {st.session_state.predicted_role}</h3>
+            <h3 style='font-size: 2.5rem; margin: 20px 0;'>🎉 {predicted_role}</h3>
         </div>
     """, unsafe_allow_html=True)
+    if st.session_state.get("prediction_source") == SOURCE_FAST:
+        st.info("Our full model was busy, so this result comes from a quicker approximate model. "
+                "Submit again in a moment for the full analysis.")
+    
+    # Runner-up careers come from the same probability ranking as the prediction
+    runner_ups = [(label, probability) for label, probability in ranking[1:RUNNER_UPS + 1]
+                  if probability > 0]
+    if runner_ups:
+        st.markdown("""
+            <h3 style='margin-top: 30px; margin-bottom: 15px;'>Other Careers That Fit You</h3>
+        """, unsafe_allow_html=True)
+        matches = "".join(
+            f"<p style='font-size: 1.1rem;'><strong>{role_name(label)}</strong> — {probability:.0%} match</p>"
+            for label, probability in runner_ups
+        )
+        st.markdown(f'<div class="result-box">{matches}</div>', unsafe_allow_html=True)
     
     # Job description
     st.markdown("""
         <h3 style='margin-top: 30px; margin-bottom: 15px;'>What Does This Role Involve?</h3>
     """, unsafe_allow_html=True)
     
-    st.markdown(f"""
-        <div class="result-box">
-            <p style='font-size: 1.1rem;'>{job_descriptions.get(st.session_state.predicted_role, "This role involves a unique combination of technical skills.")}</p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(sections["description"], unsafe_allow_html=True)
     
     # Explanation of why this role was chosen
     st.markdown("""
         <h3 style='margin-top: 30px; margin-bottom: 15px;'>Why This Role Matches You</h3>
     """, unsafe_allow_html=True)
     
+    with timer("explanation"):
+        reasons = explanation(st.session_state.answers, prediction)
     st.markdown(f"""
         <div class="result-box">
-            <p style='font-size: 1.1rem; white-space: pre-line;'>{st.session_state.explanation}</p>
+            <p style='font-size: 1.1rem; white-space: pre-line;'>{reasons}</p>
         </div>
     """, unsafe_allow_html=True)
     
-    # Career outlook
+    # Roles held by the professionals in the dataset whose ratings are closest to the user's
+    with timer("similar_profiles"):
+        found, shares = get_index().role_distribution(feature_answers(st.session_state.answers), SIMILAR_PROFILES)
     st.markdown("""
-        <h3 style='margin-top: 30px; margin-bottom: 15px;'>Career Outlook</h3>
+        <h3 style='margin-top: 30px; margin-bottom: 15px;'>Professionals With Profiles Like Yours</h3>
     """, unsafe_allow_html=True)
-    
-    career_outlooks = {
-        'Database Administrator': "The demand for Database Administrators remains strong as organizations continue to collect and leverage increasing amounts of data. Growth opportunities exist in cloud database management, data security, and big data environments.",
-        'Hardware Engineer': "Hardware Engineering offers stable career prospects with growth in specialized areas like IoT devices, embedded systems, and custom computing solutions for AI applications.",
-        'Application Support Engineer': "This role continues to see steady demand as businesses rely on complex software applications. Career advancement opportunities include moving into systems architecture or specialized application management.",
-        'Cyber Security Specialist': "Cybersecurity remains one of the fastest-growing technology fields due to increasing threats and regulatory requirements. Specialists with hands-on experience are in high demand across all industries.",
-        'Networking Engineer': "With the expansion of cloud computing and remote work infrastructures, skilled Networking Engineers remain essential. Growth areas include cloud networking, software-defined networking, and wireless technologies.",
-        'Software Developer': "Software development continues to be a cornerstone of the tech industry with strong job prospects. Specialization in areas like cloud development, mobile applications, or AI integration offers additional growth opportunities.",
-        'API Specialist': "As systems become increasingly interconnected, API development and management skills are in growing demand. This role offers career paths into software architecture or specialized integration services.",
-        'Project Manager': "Technical Project Managers remain in demand as organizations need skilled professionals to oversee complex technology implementations. Certification in agile methodologies or specific industries can enhance career prospects.",
-        'Information Security Specialist': "With increasing focus on data protection and privacy regulations, Information Security Specialists enjoy excellent job prospects and competitive compensation.",
-        'Technical Writer': "As technology becomes more complex, clear documentation becomes increasingly valuable. Growth areas include API documentation, developer experience, and user experience writing.",
-        'AI ML Specialist': "This is one of the fastest-growing fields in technology, with strong demand across industries implementing AI solutions. Continuing education is important as the field evolves rapidly.",
-        'Software tester': "Quality Assurance professionals remain essential in software development. Career growth opportunities include test automation, security testing, and quality management leadership.",
-        'Business Analyst': "Business Analysts with technical expertise are valuable bridges between business needs and technology solutions. Growth paths include product management or specialized industry analysis.",
-        'Customer Service Executive': "Technical customer service roles provide stable employment with advancement opportunities in customer success management or specialized product support.",
-        'Helpdesk Engineer': "Entry-level helpdesk positions offer excellent opportunities to gain experience across multiple technologies, with clear advancement paths to specialized technical roles.",
-        'Graphics Designer': "Technical design specialists focusing on UI/UX for digital products remain in demand. Career growth opportunities include moving into UX research, product design leadership, or specialized interface design."
-    }
-    
+    lines = ""
+    for label, share in shares[:SIMILAR_ROLES_SHOWN]:
+        name = role_name(label)
+        if label == prediction:
+            name = f"<strong>{name}</strong>"
+        lines += f"<p style='font-size: 1.1rem;'>{name} — {share:.0%}</p>"
     st.markdown(f"""
         <div class="result-box">
-            <p style='font-size: 1.1rem;'>{career_outlooks.get(st.session_state.predicted_role, "This field offers strong growth opportunities for professionals with your skill set.")}</p>
+            <p style='font-size: 1.1rem;'>Among the {found} professionals in our data whose skill ratings are closest to yours:</p>
+            {lines}
         </div>
     """, unsafe_allow_html=True)
     
-    # Technical details in an expander
-    with st.expander("View Assessment Details 🔍"):
-        st.markdown("### Your Responses")
-        for question, response in st.session_state.user_responses.items():
-            st.markdown(f"**Q:** {question}")
-            st.markdown(f"**A:** {response}")
-            st.markdown("---")
-        
-        st.markdown("### Technical Details")
-        st.write(f"Prediction Value: {st.session_state.prediction}")
-        st.write(f"Role Mapping: {st.session_state.prediction} → {st.session_state.predicted_role}")
+    # Which single one-level answer change would change the prediction. Skipped after any
+    # fallback: the full model was too slow just now, and what-if runs it with no timeout.
+    # Also skipped once the version behind the prediction is no longer retained, since
+    # another model's what-if would not match it; the session moves to the active version
+    predicted_by = st.session_state.prediction_version
+    version = resolve_version(predicted_by)
+    st.session_state.model_version = version
+    if version == predicted_by and st.session_state.get("prediction_source") not in (SOURCE_CACHE, SOURCE_FAST):
+        with timer("what_if"):
+            answer_list = mapped_answers(st.session_state.answers)
+            changes = role_changes(what_if(get_model(version), answer_list, version=version))[:WHAT_IF_SHOWN]
+        st.markdown("""
+            <h3 style='margin-top: 30px; margin-bottom: 15px;'>What Could Change Your Result?</h3>
+        """, unsafe_allow_html=True)
+        if changes:
+            lines = []
+            for change in changes:
+                area = skill_areas[change["question"]]
+                before = level_names[answer_list[change["question"]]]
+                lines.append(
+                    f"<p style='font-size: 1.1rem;'>{'Raising' if change['delta'] > 0 else 'Lowering'} "
+                    f"<strong>{area[0].upper() + area[1:]}</strong> from {before} to {level_names[change['value']]} "
+                    f"would point to <strong>{role_name(change['prediction'])}</strong> "
+                    f"({change['probability']:.0%} match)</p>"
+                )
+            st.markdown(f'<div class="result-box">{"".join(lines)}</div>', unsafe_allow_html=True)
+        else:
+            st.markdown("""
+                <div class="result-box">
+                    <p style='font-size: 1.1rem;'>No single one-level change to your answers would change your predicted role, so this is a stable match for your profile.</p>
+                </div>
+            """, unsafe_allow_html=True)
+    
+    # Career outlook
+    st.markdown("""
+        <h3 style='margin-top: 30px; margin-bottom: 15px;'>Career Outlook</h3>
+    """, unsafe_allow_html=True)
+    
+    st.markdown(sections["outlook"], unsafe_allow_html=True)
+    
+    # Technical details, rendered only when asked for
+    show_assessment_details()
     
     # Next steps suggestions
     st.markdown("""
         <h3 style='margin-top: 30px; margin-bottom: 15px;'>Recommended Next Steps</h3>
     """, unsafe_allow_html=True)
     
-    st.markdown(f"""
-        <div class="result-box">
-            <ul style='font-size: 1.1rem;'>
-                <li><strong>Research the role:</strong> Learn more about what {st.session_state.predicted_role}s do day-to-day</li>
-                <li><strong>Connect with professionals:</strong> Find people working in this field on LinkedIn or professional communities</li>
-                <li><strong>Identify skill gaps:</strong> Look for specific technologies or certifications that could strengthen your profile</li>
-                <li><strong>Look for entry points:</strong> Explore internships, junior positions, or related roles that could lead to this career</li>
-            </ul>
+    st.markdown(sections["next_steps"], unsafe_allow_html=True)
+    
+    show_navigation()
+    
+    # Footer
+    st.markdown("""
+        <div style='text-align: center; padding: 20px; margin-top: 50px; color: #666;'>
+            <p>2025 Career Advisor</p>
         </div>
     """, unsafe_allow_html=True)
-    
-    # Navigation options
+
+# The results page's interactive parts are fragments: a click in one reruns only that
+# function, not the whole page with its similar-profile and what-if sections
+@st.fragment
+def show_assessment_details():
+    if st.toggle("View Assessment Details 🔍", key="show_details"):
+        with st.container(border=True):
+            st.markdown("### Your Responses")
+            for question, response in response_pairs(st.session_state.answers):
+                st.markdown(f"**Q:** {question}")
+                st.markdown(f"**A:** {response}")
+                st.markdown("---")
+            
+            st.markdown("### Technical Details")
+            prediction = st.session_state.prediction
+            st.write(f"Prediction Value: {prediction}")
+            st.write(f"Role Mapping: {prediction} → {role_name(prediction)}")
+            st.table([{"Career": role_name(label), "Match": f"{probability:.1%}"}
+                      for label, probability in unpack_ranking(st.session_state.ranking)])
+
+@st.fragment
+def show_navigation():
+    # Navigation options; st.rerun() from a fragment reruns the whole page
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -515,14 +371,9 @@ def show_results_page():
             # Clear previous responses
             reset_form()
             st.rerun()
-    
-    # Footer
-    st.markdown("""
-        <div style='text-align: center; padding: 20px; margin-top: 50px; color: #666;'>
-            <p>2025 Career Advisor</p>
-        </div>
-    """, unsafe_allow_html=True)
 
 #Main 
 if __name__ == "__main__":
     main()
+    # Begin loading the model once the form is on screen, in case the homepage was skipped
+    start_warm_up()
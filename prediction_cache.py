@@ -0,0 +1,123 @@
+"""Bounded LRU cache of predictions keyed on the mapped answer vector.
+
+The questionnaire has 15 questions whose answers map to small integers, so the
+whole response fits in one packed integer. Identical answer patterns from any
+session then share a single cached ranking of the roles, whose first entry
+is the prediction.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from instrumentation import register_gauges
+
+# Binary copy of CleanedData.csv written by dataset.py
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CleanedData.bin")
+CACHE_SIZE = int(os.environ.get("CAREER_PREDICTION_CACHE_SIZE", "4096"))
+# Pre-populate the cache from CleanedData.csv during the model warm-up
+SEED_FROM_CSV = os.environ.get("CAREER_PREDICTION_CACHE_SEED", "0") == "1"
+
+# Three bits per answer covers every value in CleanedData.csv (0-6)
+_BITS_PER_ANSWER = 3
+_ANSWER_MASK = (1 << _BITS_PER_ANSWER) - 1
+
+
+def pack_answers(answers):
+    """Pack a sequence of small non-negative integers into a single int key"""
+    key = 0
+    for value in answers:
+        value = int(value)
+        if not 0 <= value <= _ANSWER_MASK:
+            raise ValueError(f"Answer value {value} does not fit in {_BITS_PER_ANSWER} bits")
+        key = (key << _BITS_PER_ANSWER) | value
+    return key
+
+
+def answers_key(answers, version=None):
+    """Cache key for ``answers`` scored by model ``version`` (None when unversioned)"""
+    return version, pack_answers(answers)
+
+
+class PredictionCache:
+    """Thread-safe LRU mapping of answer keys to cached results"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.seeded = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "seeded": self.seeded,
+                "hit_rate": self.hits / lookups if lookups else None,
+            }
+
+
+def seed_from_csv(model, cache=None, path=DATA_PATH, version=None):
+    """Predict every distinct answer row of CleanedData.csv in one batch and cache it.
+
+    Each row is first turned into the input the page looks up and predicts on:
+    answers in question order, mapped to the model's 0-5 levels. Rows are
+    inserted from least to most frequent so that, if they do not all fit, the
+    most common patterns are the ones that stay.
+    """
+    import numpy as np
+
+    import dataset
+    from assessment import model_inputs
+    from ranking import rank_roles
+
+    cache = shared_cache if cache is None else cache
+    rows, counts = dataset.load(path).unique_features()
+    # Options that map() to the same level ("Average", "Intermediate") share one entry
+    rows, inverse = np.unique(model_inputs(rows), axis=0, return_inverse=True)
+    counts = np.bincount(inverse.ravel(), weights=counts, minlength=len(rows))
+    order = np.argsort(counts, kind="stable")[-cache.maxsize:]
+    rows = rows[order]
+    for row, ranking in zip(rows, rank_roles(model, rows)):
+        cache.put(answers_key(row, version), ranking)
+    cache.seeded += len(rows)
+    return len(rows)
+
+
+shared_cache = PredictionCache()
+register_gauges("career_prediction_cache", shared_cache.stats, "Shared prediction cache statistics.")
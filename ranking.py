@@ -0,0 +1,41 @@
+"""Ranked career matches from a single ``predict_proba`` pass.
+
+The ensemble's prediction is the argmax of its class probabilities, so one
+``predict_proba`` call yields the predicted role and every runner-up at once.
+The same functions serve a single answer vector from the Streamlit page and
+whole batches from the service and the batch scorer.
+"""
+import numpy as np
+
+from assessment import Category_mapping
+
+
+def top_k(proba, classes, k=None):
+    """Sort each row of class probabilities, most likely first.
+
+    Returns (labels, probabilities), both of shape rows x k. The sort is
+    stable, so ties keep class order and the first column always equals the
+    argmax that ``predict`` returns.
+    """
+    proba = np.asarray(proba)
+    k = proba.shape[1] if k is None else min(k, proba.shape[1])
+    order = np.argsort(-proba, axis=1, kind="stable")[:, :k]
+    return np.asarray(classes)[order], np.take_along_axis(proba, order, axis=1)
+
+
+def rank_roles(model, answers, k=None):
+    """Ranking of (label, probability) pairs for one answer vector or a batch.
+
+    ``answers`` is either a single vector of 15 answers or a sequence of them;
+    the result is one ranking tuple, or a list with one per vector.
+    """
+    X = np.asarray(answers, dtype=np.float64)
+    single = X.ndim == 1
+    labels, probabilities = top_k(model.predict_proba(np.atleast_2d(X)), model.classes_, k)
+    rankings = [tuple(zip(row_labels, row_probabilities))
+                for row_labels, row_probabilities in zip(labels.tolist(), probabilities.tolist())]
+    return rankings[0] if single else rankings
+
+
+def role_name(label):
+    return Category_mapping.get(label, "Unknown Role")
@@ -0,0 +1,158 @@
+"""Local load generator for inference_service.py.
+
+For every batch window it starts the service in a subprocess, drives it with
+concurrent keep-alive clients sending answer vectors sampled from
+CleanedData.csv, and reports throughput and latency percentiles.
+
+    python service_loadgen.py --windows 0,1,5,10 --concurrency 32 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from model_provider import MODEL_BACKEND, MODEL_BACKENDS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVICE_PATH = os.path.join(BASE_DIR, "inference_service.py")
+DATA_PATH = os.path.join(BASE_DIR, "CleanedData.csv")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted sequence"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def sample_answers(path=DATA_PATH, count=1000, seed=0):
+    """Pick answer vectors from the skill columns of CleanedData.csv"""
+    with open(path) as f:
+        next(f)
+        rows = [[int(v) for v in line.strip().split(",")[:-1]] for line in f if line.strip()]
+    rng = random.Random(seed)
+    return [rng.choice(rows) for _ in range(count)]
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get_json(url, timeout=2):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def start_service(window_ms, max_batch, backend, startup_timeout=120):
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, SERVICE_PATH, "--port", str(port), "--window-ms", str(window_ms),
+         "--max-batch", str(max_batch), "--backend", backend],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Service exited with code {process.returncode} during startup")
+        try:
+            _get_json(f"http://127.0.0.1:{port}/health")
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Service did not become healthy in time")
+
+
+async def _client(port, payloads, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while payloads:
+            body = json.dumps({"answers": payloads.pop()}).encode()
+            start = time.perf_counter()
+            writer.write(b"POST /predict HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                         b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+            await writer.drain()
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            if b" 200 " not in status:
+                raise RuntimeError(f"Unexpected response {status!r}")
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def drive(port, answers, concurrency):
+    payloads = list(answers)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(port, payloads, latencies) for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def run_window(window_ms, answers, concurrency, max_batch, backend, warmup=50):
+    process, port = start_service(window_ms, max_batch, backend)
+    try:
+        asyncio.run(drive(port, answers[:warmup], concurrency))
+        before = _get_json(f"http://127.0.0.1:{port}/stats")["batcher"]
+        latencies, elapsed = asyncio.run(drive(port, answers, concurrency))
+        after = _get_json(f"http://127.0.0.1:{port}/stats")["batcher"]
+    finally:
+        process.terminate()
+        process.wait()
+    batches = after["batches"] - before["batches"]
+    return {
+        "window_ms": window_ms,
+        "requests": len(latencies),
+        "concurrency": concurrency,
+        "throughput_rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_batch_size": (after["rows"] - before["rows"]) / batches if batches else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the inference service at several batch windows")
+    parser.add_argument("--windows", default="0,1,5,10", help="comma-separated batch windows in ms")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--backend", default=MODEL_BACKEND, choices=MODEL_BACKENDS)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    answers = sample_answers(count=args.requests)
+    results = []
+    print(f"{'window ms':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'batch':>6}")
+    for window in [float(w) for w in args.windows.split(",")]:
+        result = run_window(window, answers, args.concurrency, args.max_batch, args.backend)
+        results.append(result)
+        print(f"{window:>9g} {result['throughput_rps']:>9.0f} {result['p50_ms']:>8.1f} "
+              f"{result['p99_ms']:>8.1f} {result['mean_batch_size'] or 0:>6.1f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Starts ``streamlit run Homepage.py`` headless in a subprocess and drives it the
+way browsers do, over the app's websocket: each simulated student opens the
+homepage, switches to Skills Assessment, submits answers sampled from
+CleanedData.csv, gets the results page and clicks "Take New Assessment", for
+``--rounds`` assessments. The session count grows level by level, and each
+level reports assessments per second, per-step latency percentiles and the
+server's memory with that many sessions connected.
+
+    python session_loadgen.py --sessions 1,2,4,8,16 --rounds 3
+
+AppTest cannot be used for this: it swaps process-wide Streamlit state on
+every run, so simulated sessions would have to take turns instead of
+competing for the server like real ones. ``CAREER_*`` settings in the
+environment are passed on to the server, except that the simulated students
+are kept out of the submission log and the cohort analytics.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+from assessment import QUESTION_TO_FEATURE, options
+from mmap_model import read_memory
+from service_loadgen import _free_port, percentile, sample_answers
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(BASE_DIR, "Homepage.py")
+ASSESSMENT_PAGE = "Skills Assessment"
+SUBMIT_LABEL = "See My Results"
+NEW_ASSESSMENT_LABEL = "📋 Take New Assessment"
+STEPS = ("homepage", "assessment", "submit", "new_assessment")
+PERCENTILES = (50, 95, 99)
+
+# Simulated students are not real submissions
+SERVER_ENV = {"CAREER_SUBMISSION_LOG": "off", "CAREER_ANALYTICS_PERSIST": "0"}
+
+
+def start_server(startup_timeout=120):
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--server.enableXsrfProtection", "false",
+         "--browser.gatherUsageStats", "false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env={**os.environ, **SERVER_ENV},
+    )
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Streamlit exited with code {process.returncode} during startup")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=2).close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Streamlit did not become healthy in time")
+
+
+class Session:
+    """One browser tab: a websocket to the server and the widgets of the last run"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.page_hash = ""
+        self.pages = {}
+        self.elements = []
+        # Widget id -> id of the fragment that rendered it, which the browser sends back on a change
+        self.fragments = {}
+
+    @classmethod
+    async def connect(cls, port):
+        import websockets
+
+        websocket = await websockets.connect(f"ws://127.0.0.1:{port}/_stcore/stream",
+                                             subprotocols=["streamlit"], max_size=None)
+        return cls(websocket)
+
+    async def rerun(self, page_hash=None, widget_states=(), timeout=60):
+        """Ask for a script run and collect its elements until it finishes.
+
+        Like the browser, a change to a widget inside a fragment reruns only that fragment.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        message.rerun_script.page_script_hash = self.page_hash if page_hash is None else page_hash
+        message.rerun_script.widget_states.widgets.extend(widget_states)
+        fragment_ids = {self.fragments.get(state.id, "") for state in widget_states}
+        if page_hash is None and len(fragment_ids) == 1:
+            message.rerun_script.fragment_id = fragment_ids.pop()
+        await self.websocket.send(message.SerializeToString())
+        elements = []
+        while True:
+            forward = ForwardMsg()
+            forward.ParseFromString(await asyncio.wait_for(self.websocket.recv(), timeout))
+            kind = forward.WhichOneof("type")
+            if kind == "navigation":
+                self.pages = {page.page_name: page.page_script_hash for page in forward.navigation.app_pages}
+                self.page_hash = forward.navigation.page_script_hash
+            elif kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                elements.append(element)
+                widget_id = getattr(getattr(element, element.WhichOneof("type")), "id", "")
+                if widget_id and forward.delta.fragment_id:
+                    self.fragments[widget_id] = forward.delta.fragment_id
+            elif kind == "script_finished":
+                # st.rerun() and st.switch_page() end a run early and start another
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    elements = []
+                    continue
+                break
+        failures = [e.exception.message for e in elements if e.WhichOneof("type") == "exception"]
+        if failures:
+            raise RuntimeError(f"App raised: {failures[0]}")
+        self.elements = elements
+        return elements
+
+    def widgets(self, kind):
+        return [getattr(e, kind) for e in self.elements if e.WhichOneof("type") == kind]
+
+    def button(self, label):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        for button in self.widgets("button"):
+            if button.label.startswith(label):
+                return WidgetState(id=button.id, trigger_value=True)
+        raise RuntimeError(f"No {label!r} button on the page")
+
+    async def close(self):
+        await self.websocket.close()
+
+
+def answer_options(row):
+    """Option labels for a CleanedData.csv row, in question order"""
+    return [options[row[column]] for column in QUESTION_TO_FEATURE]
+
+
+async def _step(latencies, name, run):
+    start = time.perf_counter()
+    result = await run
+    latencies[name].append(time.perf_counter() - start)
+    return result
+
+
+async def student(session, rows, rounds, latencies, rejected, think):
+    from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+    await _step(latencies, "homepage", session.rerun(""))
+    await _step(latencies, "assessment", session.rerun(session.pages[ASSESSMENT_PAGE]))
+    for _ in range(rounds):
+        await asyncio.sleep(think())
+        radios = session.widgets("radio")
+        answers = [WidgetState(id=radio.id, string_value=value)
+                   for radio, value in zip(radios, answer_options(rows.pop()))]
+        await _step(latencies, "submit", session.rerun(widget_states=answers + [session.button(SUBMIT_LABEL)]))
+        if not any("Your Predicted Career Path" in m.body for m in session.widgets("markdown")):
+            # The page turns away all-"Not Interested" answers (a few rows of the
+            # dataset) and shows the form again, which the next round submits
+            rejected.append(1)
+            continue
+        await asyncio.sleep(think())
+        await _step(latencies, "new_assessment",
+                    session.rerun(widget_states=[session.button(NEW_ASSESSMENT_LABEL)]))
+
+
+async def run_level(port, server_pid, sessions, rows, rounds, think):
+    latencies = {step: [] for step in STEPS}
+    rejected = []
+    connected = [await Session.connect(port) for _ in range(sessions)]
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(student(session, rows, rounds, latencies, rejected, think) for session in connected))
+        elapsed = time.perf_counter() - start
+        # Measured while every session of this level is still connected
+        memory = read_memory(server_pid)
+    finally:
+        for session in connected:
+            await session.close()
+    return latencies, elapsed, memory, len(rejected)
+
+
+def _percentile_cell(step):
+    return "/".join(f"{step[f'p{pct}_ms']:.0f}" for pct in PERCENTILES)
+
+
+def run(args):
+    levels = [int(n) for n in args.sessions.split(",")]
+    rows = sample_answers(count=sum(levels) * args.rounds, seed=args.seed)
+    rng = random.Random(args.seed)
+    think = (lambda: rng.uniform(0, 2 * args.think_ms) / 1000) if args.think_ms else (lambda: 0)
+
+    process, port = start_server()
+    results = []
+    try:
+        # One warm-up session, so the first level does not pay for imports and the model load
+        asyncio.run(run_level(port, process.pid, 1, sample_answers(count=1, seed=args.seed + 1), 1, lambda: 0))
+        baseline = read_memory(process.pid)
+        print(f"Server RSS after warm-up: {baseline['rss'] / 2 ** 20:.1f} MB")
+        print("Step latencies are p50/p95/p99 in ms")
+        print(f"{'sessions':>8} {'assess/s':>9} " + " ".join(f"{step:>16}" for step in STEPS)
+              + f" {'rejected':>8} {'RSS MB':>8} {'+MB/session':>11}")
+        for sessions in levels:
+            latencies, elapsed, memory, rejected = asyncio.run(
+                run_level(port, process.pid, sessions, rows, args.rounds, think))
+            growth = (memory["rss"] - baseline["rss"]) / 2 ** 20
+            result = {
+                "sessions": sessions,
+                "assessments": sessions * args.rounds,
+                "rejected_submits": rejected,
+                "assessments_per_second": sessions * args.rounds / elapsed,
+                "steps": {step: {f"p{pct}_ms": percentile(values, pct) * 1000 for pct in PERCENTILES}
+                          for step, values in latencies.items()},
+                "rss_mb": memory["rss"] / 2 ** 20,
+                "rss_growth_mb": growth,
+                "rss_growth_per_session_mb": growth / sessions,
+            }
+            results.append(result)
+            cells = " ".join(f"{_percentile_cell(result['steps'][step]):>16}" for step in STEPS)
+            print(f"{sessions:>8} {result['assessments_per_second']:>9.2f} {cells} {rejected:>8} "
+                  f"{result['rss_mb']:>8.1f} {result['rss_growth_per_session_mb']:>11.2f}")
+    finally:
+        process.terminate()
+        process.wait()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"baseline_rss_mb": baseline["rss"] / 2 ** 20, "rounds": args.rounds,
+                       "think_ms": args.think_ms, "levels": results}, f, indent=2)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Streamlit app with concurrent simulated sessions")
+    parser.add_argument("--sessions", default="1,2,4,8,16", help="comma-separated session counts, one level each")
+    parser.add_argument("--rounds", type=int, default=3, help="assessments each session completes per level")
+    parser.add_argument("--think-ms", type=float, default=0,
+                        help="mean pause between a session's steps (0 = back to back)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
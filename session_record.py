@@ -0,0 +1,140 @@
+"""Compact per-session record of a submitted assessment.
+
+Streamlit keeps every session's state in memory until the session ends, and
+most sessions sit idle on the results page. So a session keeps only packed
+values:
+
+    answers        15 bytes, the option index (0-6) chosen for each question
+    prediction     the predicted role's label
+    ranking        every label with its probability, 3 bytes per role
+    model_version  the version the session is pinned to
+    prediction_version  the version that made the prediction, which stays put
+
+Everything the results page shows is derived on demand from these and from
+the tables in assessment.py, which every session shares: the question and
+option texts, the answers mapped for the model, the role names and the
+explanation.
+
+    python session_record.py bench --sessions 5000
+"""
+import argparse
+import struct
+import sys
+import tracemalloc
+
+from assessment import (Category_mapping, FEATURE_TO_QUESTION, OPTION_LEVELS, QUESTION_TO_FEATURE,
+                        generate_explanation, options, questions)
+
+_OPTION_INDEX = {option: index for index, option in enumerate(options)}
+
+# A ranking entry: the label, then the probability in hundredths of a percent
+_RANKING_ENTRY = struct.Struct("<BH")
+_PROBABILITY_SCALE = 10000
+
+
+def pack_responses(responses):
+    """Option indices of a {question: option} dict, in question order, as bytes"""
+    return bytes(_OPTION_INDEX[responses[question]] for question in questions)
+
+
+def response_pairs(answers):
+    """(question, option) pairs of packed answers; the strings are the shared ones in assessment.py"""
+    return [(question, options[answer]) for question, answer in zip(questions, answers)]
+
+
+def mapped_answers(answers):
+    """Packed answers as the model input mapping() produces"""
+    return [OPTION_LEVELS[answer] for answer in answers]
+
+
+def feature_answers(answers):
+    """Packed answers as option indices in CleanedData.csv column order"""
+    return [answers[position] for position in FEATURE_TO_QUESTION]
+
+
+def explanation(answers, prediction):
+    return generate_explanation(dict(response_pairs(answers)), Category_mapping.get(prediction, "Unknown Role"))
+
+
+def pack_ranking(ranking):
+    return b"".join(_RANKING_ENTRY.pack(int(label), round(float(probability) * _PROBABILITY_SCALE))
+                    for label, probability in ranking)
+
+
+def unpack_ranking(packed):
+    """(label, probability) pairs of a packed ranking, in ranking order"""
+    return [(label, probability / _PROBABILITY_SCALE) for label, probability in _RANKING_ENTRY.iter_unpack(packed)]
+
+
+def _legacy_state(answers, ranking, version):
+    """Session state as save_user_responses kept it before it was packed"""
+    responses_by_question = {question: options[answer] for question, answer in zip(questions, answers)}
+    role = Category_mapping[ranking[0][0]]
+    return {
+        "user_responses": responses_by_question,
+        "numeric_responses": mapped_answers(answers),
+        "model_version": version,
+        "prediction_source": "model",
+        "prediction": ranking[0][0],
+        "ranking": ranking,
+        "predicted_role": role,
+        "explanation": generate_explanation(responses_by_question, role),
+    }
+
+
+def _compact_state(answers, ranking, version):
+    return {
+        "answers": bytes(answers),
+        "model_version": version,
+        "prediction_version": version,
+        "prediction_source": "model",
+        "prediction": ranking[0][0],
+        "ranking": pack_ranking(ranking),
+    }
+
+
+def _measure(build, samples):
+    """Bytes allocated per session to keep one state built from each sample"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    states = [build(*sample) for sample in samples]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del states
+    return (after - before) / len(samples)
+
+
+def bench(args):
+    from model_provider import get_model
+    from ranking import rank_roles
+    from service_loadgen import sample_answers
+
+    rows = sample_answers(count=args.sessions, seed=args.seed)
+    answers = [[row[position] for position in QUESTION_TO_FEATURE] for row in rows]
+    # One ranking per session, as each submit produces its own; the version string
+    # is shared by every session pinned to it, as in the app
+    rankings = rank_roles(get_model(), [mapped_answers(a) for a in answers])
+    samples = [(a, ranking, "20260101-000000-0123abcd") for a, ranking in zip(answers, rankings)]
+    for _, ranking, _ in samples:
+        if [label for label, _ in unpack_ranking(pack_ranking(ranking))] != [label for label, _ in ranking]:
+            raise AssertionError("Packing a ranking changed the order of the roles")
+    legacy = _measure(_legacy_state, samples)
+    compact = _measure(_compact_state, samples)
+    print(f"{args.sessions} sessions with answers sampled from CleanedData.csv")
+    print(f"  before: {legacy:8.0f} bytes per session ({legacy * args.sessions / 1e6:.1f} MB)")
+    print(f"  after:  {compact:8.0f} bytes per session ({compact * args.sessions / 1e6:.1f} MB), "
+          f"{legacy / compact:.1f}x smaller")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory each session's results take")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench_parser = sub.add_parser("bench")
+    bench_parser.add_argument("--sessions", type=int, default=5000)
+    bench_parser.add_argument("--seed", type=int, default=0)
+    return bench(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
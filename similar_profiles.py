@@ -0,0 +1,100 @@
+"""Nearest-neighbour lookup of similar profiles in CleanedData.csv.
+
+The index holds each distinct (answers, role) row of the dataset once, with
+the number of professionals sharing it. Both metrics reduce to one small
+matrix-vector product per query: squared L2 through the usual norm expansion,
+and L1 through thermometer codes, where a rating v becomes v ones followed by
+zeros so that |a - b| is the Hamming distance between the codes. Distances
+are small integers, so the k nearest professionals are found by counting
+rather than sorting. The dataset rates skills on the questionnaire's 7-option
+scale, so queries use option indices (0-6) in CSV column order, as
+``session_record.feature_answers`` gives them.
+"""
+import threading
+
+import numpy as np
+
+import dataset
+from assessment import FEATURE_COLUMNS, options
+
+METRICS = ("l1", "l2")
+DEFAULT_K = 25
+
+
+def _thermometer(values, levels):
+    values = np.asarray(values)
+    return (values[..., np.newaxis] > np.arange(levels)).reshape(*values.shape[:-1], -1).astype(np.float32)
+
+
+class ProfileIndex:
+    def __init__(self, features, roles, counts, levels=len(options) - 1):
+        self.features = np.asarray(features, dtype=np.uint8)
+        self.roles = np.asarray(roles, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.professionals = int(self.counts.sum())
+        self.levels = max(levels, int(self.features.max(initial=0)))
+        # float32 represents every partial sum here exactly, so distances stay integers
+        self._values = self.features.astype(np.float32)
+        self._sums = self._values.sum(axis=1)
+        self._squares = (self._values ** 2).sum(axis=1)
+        self._codes = _thermometer(self.features, self.levels)
+
+    @classmethod
+    def from_dataset(cls, path=dataset.DATASET_PATH):
+        data = dataset.load(path)
+        unique = data.unique
+        feature_index = [data.columns.index(c) for c in FEATURE_COLUMNS]
+        return cls(unique[:, feature_index], unique[:, data.columns.index(dataset.LABEL_COLUMN)], data.counts)
+
+    def __len__(self):
+        return len(self.features)
+
+    def distances(self, answers, metric="l1"):
+        answers = np.asarray(answers, dtype=np.float32)
+        if metric == "l1":
+            distance = self._sums + answers.sum() - 2.0 * (self._codes @ _thermometer(answers, self.levels))
+        elif metric == "l2":
+            # Squared, which ranks neighbours the same and stays an integer
+            distance = self._squares + answers @ answers - 2.0 * (self._values @ answers)
+        else:
+            raise ValueError(f"Unknown metric {metric!r}, expected one of {METRICS}")
+        return np.rint(distance).astype(np.int64)
+
+    def query(self, answers, k=DEFAULT_K, metric="l1"):
+        """Rows within the smallest radius that covers at least k professionals.
+
+        Everyone tied at that radius is included, so the result may cover a
+        few more than k. Returns (row indices sorted by distance, distances).
+        """
+        distance = self.distances(answers, metric)
+        covered = np.cumsum(np.bincount(distance, weights=self.counts))
+        radius = int(np.searchsorted(covered, min(k, self.professionals)))
+        rows = np.flatnonzero(distance <= radius)
+        rows = rows[np.argsort(distance[rows], kind="stable")]
+        return rows, distance[rows]
+
+    def role_distribution(self, answers, k=DEFAULT_K, metric="l1"):
+        """Share of each role among the nearest professionals, largest first.
+
+        Returns (number of professionals considered, [(label, share), ...]).
+        """
+        rows, _ = self.query(answers, k, metric)
+        totals = np.bincount(self.roles[rows], weights=self.counts[rows])
+        found = int(totals.sum())
+        labels = np.flatnonzero(totals)
+        labels = labels[np.argsort(-totals[labels], kind="stable")]
+        return found, [(int(label), float(totals[label] / found)) for label in labels]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """The index over CleanedData.bin, built once per process"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ProfileIndex.from_dataset()
+    return _index
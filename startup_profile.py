@@ -0,0 +1,139 @@
+"""Cold-start profile of each page: where import time and first render go.
+
+Every page runs in a fresh interpreter under ``python -X importtime`` through
+Streamlit's AppTest, the way a new container serves its first visitor. The
+report splits each run into phases, and for each phase gives the wall time, the
+time spent importing, and the packages that took longest:
+
+    interpreter    site and the profiler itself, before anything of the app
+    streamlit      importing Streamlit and its test harness
+    first_render   the page's first script run, its own imports included
+    warm_up        the background model load the page started, if any
+
+    python startup_profile.py                              # every page
+    python startup_profile.py --page Homepage.py --json startup.json
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGES = ["Homepage.py"] + sorted(os.path.relpath(p, BASE_DIR) for p in glob.glob(os.path.join(BASE_DIR, "pages", "*.py")))
+# Packages that should only be imported once a prediction needs them
+HEAVY_PACKAGES = ("sklearn", "joblib", "xgboost", "scipy", "pandas")
+# Packages listed per phase
+TOP_IMPORTS = 5
+
+MARKER = "startup-profile:"
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def _mark(phase, seconds):
+    sys.stderr.flush()
+    # Straight to the descriptor, so the marker lands between the interpreter's importtime lines
+    os.write(2, f"{MARKER} {phase} {seconds:.6f}\n".encode())
+
+
+def _run_page(page):
+    """Child process: run the phases, marking the end of each on stderr"""
+    _mark("interpreter", 0.0)
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    _mark("streamlit", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(BASE_DIR, page), default_timeout=120).run()
+    _mark("first_render", time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(f"{page} raised: {at.exception}")
+
+    if "model_provider" in sys.modules:
+        import model_provider
+        if model_provider.model_stats()["warm_up_started"]:
+            start = time.perf_counter()
+            model_provider.start_warm_up().result()
+            _mark("warm_up", time.perf_counter() - start)
+    return 0
+
+
+def _package(module):
+    root = module.split(".")[0]
+    return root if not os.path.exists(os.path.join(BASE_DIR, root + ".py")) else f"{root} (app)"
+
+
+def parse(stderr):
+    """Phases of a child's stderr: top-level import times per package and the phase's wall time"""
+    phases = []
+    imports = {}
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            _, phase, seconds = line.split()
+            phases.append({"phase": phase, "wall_ms": float(seconds) * 1000 if phase != "interpreter" else None,
+                           "imports_ms": sum(imports.values()) / 1000,
+                           "packages_ms": {name: us / 1000 for name, us in
+                                           sorted(imports.items(), key=lambda item: -item[1])}})
+            imports = {}
+            continue
+        match = _IMPORT_LINE.match(line)
+        # Only top-level imports, whose cumulative time already includes what they import
+        if match and not match.group(3):
+            package = _package(match.group(4))
+            imports[package] = imports.get(package, 0) + int(match.group(2))
+    return phases
+
+
+def profile(page):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", page],
+                          cwd=BASE_DIR, capture_output=True, text=True)
+    total = time.perf_counter() - start
+    if proc.returncode:
+        tail = "\n".join(line for line in proc.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"Profiling {page} failed:\n{tail[-2000:]}")
+    phases = parse(proc.stderr)
+    rendered = {name for phase in phases if phase["phase"] != "warm_up" for name in phase["packages_ms"]}
+    return {
+        "page": page,
+        "process_seconds": total,
+        "phases": phases,
+        "heavy_before_render": sorted(name for name in rendered if name in HEAVY_PACKAGES),
+    }
+
+
+def _report(result):
+    print(f"{result['page']}: {result['process_seconds']:.2f}s cold start")
+    print(f"  {'phase':<14} {'wall ms':>9} {'imports ms':>11}   largest imports")
+    for phase in result["phases"]:
+        wall = f"{phase['wall_ms']:9.1f}" if phase["wall_ms"] is not None else f"{'-':>9}"
+        largest = ", ".join(f"{name} {ms:.1f}" for name, ms in list(phase["packages_ms"].items())[:TOP_IMPORTS])
+        print(f"  {phase['phase']:<14} {wall} {phase['imports_ms']:11.1f}   {largest}")
+    print(f"  heavy packages imported by the first render: {', '.join(result['heavy_before_render']) or 'none'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile import time and first render of each page")
+    parser.add_argument("--page", action="append", choices=PAGES, help="page to profile (default every page)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        return _run_page(args.child)
+
+    results = []
+    for page in args.page or PAGES:
+        results.append(profile(page))
+        _report(results[-1])
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "python": sys.version.split()[0],
+                       "pages": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""Images the app serves itself, from static/ (see .streamlit/config.toml).
+
+The homepage illustration is drawn from one list of shapes in a 1200 x 600
+frame. The build writes that list out as an SVG, and as WebP variants that
+browsers pick from by screen width. No page depends on a third-party image
+host, so the app also works without internet access. Each file name carries a
+hash of its content, so the files never change under a URL. Streamlit sends
+them with an ETag but without a Cache-Control header; a proxy in front of it
+can mark ``/app/static/`` as immutable. The SVG also gets a gzip copy next to
+it for proxies that serve precompressed files (nginx ``gzip_static``).
+
+    python static_assets.py build    # redraw, precompress, rewrite static/manifest.json
+    python static_assets.py check    # fail if static/ is incomplete or a page links off-site
+"""
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+MANIFEST_PATH = os.path.join(STATIC_DIR, "manifest.json")
+# Where Streamlit serves STATIC_DIR, relative to the page
+STATIC_URL = "app/static/"
+
+WIDTH, HEIGHT = 1200, 600
+# Widths of the WebP variants, covering phones to high-density laptop screens
+VARIANT_WIDTHS = (480, 960, 1440)
+WEBP_QUALITY = 82
+# Drawn this many times larger, then scaled down, to smooth the edges
+SUPERSAMPLE = 2
+COMPRESSIBLE = (".svg",)
+
+
+def _bezier(p0, p1, p2, p3, steps=48):
+    points = []
+    for step in range(steps + 1):
+        t = step / steps
+        u = 1 - t
+        points.append((u ** 3 * p0[0] + 3 * u * u * t * p1[0] + 3 * u * t * t * p2[0] + t ** 3 * p3[0],
+                       u ** 3 * p0[1] + 3 * u * u * t * p1[1] + 3 * u * t * t * p2[1] + t ** 3 * p3[1]))
+    return points
+
+
+def _hill(base, height, phase, wavelength):
+    ridge = [(x, base - height * (0.5 + 0.5 * math.sin(x / wavelength + phase))) for x in range(0, WIDTH + 1, 20)]
+    return [(0, HEIGHT)] + ridge + [(WIDTH, HEIGHT)]
+
+
+def _flag(x, y, color, size=1.0):
+    return [
+        ("line", [(x, y), (x, y - 70 * size)], 5 * size, "#37474f"),
+        ("polygon", [(x + 2, y - 70 * size), (x + 48 * size, y - 57 * size), (x + 2, y - 44 * size)], color),
+    ]
+
+
+def _gear(cx, cy, radius, color):
+    teeth = [("polygon", [(cx + math.cos(a + d) * r, cy + math.sin(a + d) * r)
+                          for d, r in ((-0.18, radius * 0.8), (-0.12, radius * 1.25), (0.12, radius * 1.25),
+                                       (0.18, radius * 0.8))], color)
+             for a in (i * math.pi / 4 for i in range(8))]
+    return teeth + [("circle", cx, cy, radius, color), ("circle", cx, cy, radius * 0.42, "#e8f1fb")]
+
+
+def hero_shapes():
+    """The homepage illustration: a road climbing past milestones towards a goal"""
+    road = _bezier((170, 640), (420, 420), (620, 560), (930, 190))
+    shapes = [
+        ("rect", 0, 0, WIDTH, HEIGHT, 0, "#e8f1fb"),
+        ("circle", 1100, 96, 52, "#ffd166"),
+        ("polygon", _hill(330, 90, 0.6, 150), "#c7e3cf"),
+        ("polygon", _hill(420, 70, 2.1, 110), "#9fd1ae"),
+        ("line", road, 74, "#5b6770"),
+    ]
+    # Dashed centre line along the road
+    shapes += [("line", road[i:i + 3], 5, "#ffffff") for i in range(2, len(road) - 3, 5)]
+    for (x, y), color in zip((road[14], road[28], road[40]), ("#ef476f", "#118ab2", "#06d6a0")):
+        shapes += _flag(x + 44, y - 10, color)
+    end = road[-1]
+    shapes += _flag(end[0] + 10, end[1] - 30, "#ffd166", size=1.5)
+    shapes += [
+        # Signpost at the start of the road
+        ("line", [(300, 600), (300, 430)], 8, "#6d4c41"),
+        ("polygon", [(250, 440), (360, 440), (380, 458), (360, 476), (250, 476)], "#8d6e63"),
+        ("polygon", [(350, 490), (240, 490), (220, 508), (240, 526), (350, 526)], "#a1887f"),
+        # The student setting off
+        ("circle", 170, 444, 20, "#ffcc80"),
+        ("rect", 152, 468, 36, 62, 12, "#118ab2"),
+        ("line", [(160, 528), (150, 580)], 9, "#37474f"),
+        ("line", [(180, 528), (194, 578)], 9, "#37474f"),
+        ("line", [(154, 480), (132, 520)], 8, "#118ab2"),
+        ("line", [(186, 480), (214, 506)], 8, "#118ab2"),
+        # Laptop, chart and code brackets floating above the hills
+        ("rect", 520, 120, 120, 78, 8, "#37474f"),
+        ("rect", 530, 130, 100, 58, 4, "#8ecae6"),
+        ("polygon", [(500, 204), (660, 204), (646, 218), (514, 218)], "#546e7a"),
+        ("rect", 990, 490, 22, 50, 3, "#ef476f"),
+        ("rect", 1022, 466, 22, 74, 3, "#ffd166"),
+        ("rect", 1054, 436, 22, 104, 3, "#06d6a0"),
+        ("line", [(372, 150), (346, 176), (372, 202)], 8, "#118ab2"),
+        ("line", [(430, 150), (456, 176), (430, 202)], 8, "#118ab2"),
+        ("line", [(412, 144), (390, 208)], 8, "#118ab2"),
+    ]
+    shapes += _gear(1090, 300, 34, "#8d99ae")
+    return shapes
+
+
+def _points(points, scale=1.0):
+    return [(round(x * scale, 2), round(y * scale, 2)) for x, y in points]
+
+
+def to_svg(shapes):
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {WIDTH} {HEIGHT}" '
+             f'role="img" aria-label="A road climbing past milestones towards a goal">']
+    for kind, *args in shapes:
+        if kind == "rect":
+            x, y, w, h, radius, fill = args
+            parts.append(f'<rect x="{x}" y="{y}" width="{w}" height="{h}" rx="{radius}" fill="{fill}"/>')
+        elif kind == "circle":
+            cx, cy, radius, fill = args
+            parts.append(f'<circle cx="{cx:g}" cy="{cy:g}" r="{radius:g}" fill="{fill}"/>')
+        elif kind == "polygon":
+            points, fill = args
+            parts.append(f'<polygon points="{" ".join(f"{x:g},{y:g}" for x, y in _points(points))}" fill="{fill}"/>')
+        else:
+            points, width, color = args
+            parts.append(f'<polyline points="{" ".join(f"{x:g},{y:g}" for x, y in _points(points))}" fill="none" '
+                         f'stroke="{color}" stroke-width="{width:g}" stroke-linejoin="round"/>')
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def to_image(shapes, width):
+    from PIL import Image, ImageDraw
+
+    scale = width / WIDTH * SUPERSAMPLE
+    image = Image.new("RGB", (round(WIDTH * scale), round(HEIGHT * scale)))
+    draw = ImageDraw.Draw(image)
+    for kind, *args in shapes:
+        if kind == "rect":
+            x, y, w, h, radius, fill = args
+            draw.rounded_rectangle([x * scale, y * scale, (x + w) * scale, (y + h) * scale], radius * scale, fill=fill)
+        elif kind == "circle":
+            cx, cy, radius, fill = args
+            draw.ellipse([(cx - radius) * scale, (cy - radius) * scale, (cx + radius) * scale, (cy + radius) * scale],
+                         fill=fill)
+        elif kind == "polygon":
+            points, fill = args
+            draw.polygon(_points(points, scale), fill=fill)
+        else:
+            points, line_width, color = args
+            draw.line(_points(points, scale), fill=color, width=max(1, round(line_width * scale)), joint="curve")
+    return image.resize((width, round(HEIGHT * width / WIDTH)), Image.LANCZOS)
+
+
+def _hashed_name(name, content):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:10]}{ext}"
+
+
+def build(directory=STATIC_DIR):
+    """Write every asset under a content-hashed name, then the manifest; returns the manifest"""
+    import io
+
+    shapes = hero_shapes()
+    files = {"hero.svg": to_svg(shapes).encode()}
+    for width in VARIANT_WIDTHS:
+        buffer = io.BytesIO()
+        to_image(shapes, width).save(buffer, "WEBP", quality=WEBP_QUALITY, method=6)
+        files[f"hero-{width}.webp"] = buffer.getvalue()
+
+    os.makedirs(directory, exist_ok=True)
+    manifest = {}
+    for name, content in files.items():
+        hashed = _hashed_name(name, content)
+        manifest[name] = hashed
+        with open(os.path.join(directory, hashed), "wb") as f:
+            f.write(content)
+        if name.endswith(COMPRESSIBLE):
+            with open(os.path.join(directory, hashed + ".gz"), "wb") as f:
+                f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    # Drop the files of earlier builds
+    keep = set(manifest.values()) | {hashed + ".gz" for hashed in manifest.values()} | {os.path.basename(MANIFEST_PATH)}
+    for path in glob.glob(os.path.join(directory, "*")):
+        if os.path.basename(path) not in keep:
+            os.remove(path)
+    path = os.path.join(directory, os.path.basename(MANIFEST_PATH))
+    staging = f"{path}.tmp{os.getpid()}"
+    with open(staging, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(staging, path)
+    return manifest
+
+
+def load_manifest(path=MANIFEST_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+_OFFSITE_URL = re.compile(r"""(?:src|href|srcset|st\.image\()\s*=?\s*["']?(https?://[^"'\s)]+)""")
+
+
+def check(directory=STATIC_DIR):
+    """Problems with the built assets and with the pages' links; empty when all is well"""
+    problems = []
+    try:
+        manifest = load_manifest(os.path.join(directory, os.path.basename(MANIFEST_PATH)))
+    except (OSError, ValueError) as exc:
+        return [f"No readable manifest: {exc}"]
+    for name, hashed in sorted(manifest.items()):
+        path = os.path.join(directory, hashed)
+        if not os.path.isfile(path):
+            problems.append(f"{name}: {hashed} is missing")
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        if _hashed_name(name, content) != hashed:
+            problems.append(f"{name}: {hashed} does not match its content hash")
+        if name.endswith(COMPRESSIBLE):
+            try:
+                with gzip.open(path + ".gz") as f:
+                    if f.read() != content:
+                        problems.append(f"{name}: {hashed}.gz is out of date")
+            except OSError:
+                problems.append(f"{name}: {hashed}.gz is missing")
+    for page in ["Homepage.py"] + sorted(glob.glob(os.path.join(BASE_DIR, "pages", "*.py"))):
+        with open(os.path.join(BASE_DIR, page), encoding="utf-8") as f:
+            for url in _OFFSITE_URL.findall(f.read()):
+                problems.append(f"{os.path.relpath(os.path.join(BASE_DIR, page), BASE_DIR)} loads {url}")
+    return problems
+
+
+def hero_html(manifest, alt="Career path illustration"):
+    """<picture> markup that lets the browser pick the WebP variant for its width, with the SVG as fallback"""
+    srcset = ", ".join(f"{STATIC_URL}{manifest[f'hero-{width}.webp']} {width}w" for width in VARIANT_WIDTHS)
+    return (f'<picture><source type="image/webp" srcset="{srcset}" sizes="(max-width: 768px) 92vw, 60vw">'
+            f'<img src="{STATIC_URL}{manifest["hero.svg"]}" alt="{alt}" width="{WIDTH}" height="{HEIGHT}" '
+            f'style="width: 100%; height: auto; display: block;"></picture>')
+
+
+_hero = None
+
+
+def hero():
+    """The homepage illustration's markup, built from the manifest once per process"""
+    global _hero
+    if _hero is None:
+        _hero = hero_html(load_manifest())
+    return _hero
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and check the static files the pages serve")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build")
+    sub.add_parser("check")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        for name, hashed in sorted(build().items()):
+            size = os.path.getsize(os.path.join(STATIC_DIR, hashed))
+            compressed = os.path.join(STATIC_DIR, hashed + ".gz")
+            note = f", {os.path.getsize(compressed):,} gzipped" if os.path.exists(compressed) else ""
+            print(f"{name:<16} {hashed:<28} {size:>8,} bytes{note}")
+        return 0
+    problems = check()
+    for problem in problems:
+        print(problem)
+    print("static assets OK" if not problems else f"{len(problems)} problem(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
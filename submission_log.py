@@ -0,0 +1,293 @@
+"""Append-only log of assessment submissions, written off the script thread.
+
+``log_submission`` only appends a record to an in-memory buffer. A background
+thread writes the buffer in batches, once ``CAREER_SUBMISSION_LOG_BATCH``
+records are waiting or every ``CAREER_SUBMISSION_LOG_FLUSH`` seconds, to JSON
+lines or SQLite files under ``submissions/``. A file is rotated when it grows
+past ``CAREER_SUBMISSION_LOG_ROTATE_MB`` or gets older than
+``CAREER_SUBMISSION_LOG_ROTATE_HOURS``, and whatever is buffered is written at
+interpreter exit. If the writer falls behind by ``CAREER_SUBMISSION_LOG_MAX_PENDING``
+records, new records are dropped and counted rather than blocking the page.
+
+    python submission_log.py bench --format sqlite --records 50000 --rate 5000
+"""
+import argparse
+import atexit
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from instrumentation import register_gauges, timer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_DIR = os.environ.get("CAREER_SUBMISSION_LOG_DIR", os.path.join(BASE_DIR, "submissions"))
+# "jsonl", "sqlite", or "off"
+LOG_FORMAT = os.environ.get("CAREER_SUBMISSION_LOG", "jsonl")
+FLUSH_SECONDS = float(os.environ.get("CAREER_SUBMISSION_LOG_FLUSH", "1.0"))
+BATCH_SIZE = int(os.environ.get("CAREER_SUBMISSION_LOG_BATCH", "1000"))
+MAX_PENDING = int(os.environ.get("CAREER_SUBMISSION_LOG_MAX_PENDING", "100000"))
+ROTATE_BYTES = int(float(os.environ.get("CAREER_SUBMISSION_LOG_ROTATE_MB", "64")) * 1024 * 1024)
+ROTATE_SECONDS = float(os.environ.get("CAREER_SUBMISSION_LOG_ROTATE_HOURS", "24")) * 3600
+
+FIELDS = ("time", "answers", "prediction", "model_version", "latency_ms", "source")
+
+
+class _RotatingFile:
+    """Names and rotates the files a writer appends to"""
+
+    suffix = ""
+
+    def __init__(self, directory, rotate_bytes=ROTATE_BYTES, rotate_seconds=ROTATE_SECONDS):
+        self.directory = directory
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.path = None
+        self.opened_at = None
+        self.rotations = 0
+
+    def _next_path(self):
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+        path = os.path.join(self.directory, f"submissions-{stamp}-{os.getpid()}{self.suffix}")
+        index = 1
+        while os.path.exists(path):
+            path = os.path.join(self.directory, f"submissions-{stamp}-{os.getpid()}-{index}{self.suffix}")
+            index += 1
+        return path
+
+    def due(self):
+        return self.path is None or (time.time() - self.opened_at >= self.rotate_seconds
+                                     or self.size() >= self.rotate_bytes)
+
+    def rotate(self):
+        if self.path is not None:
+            self.close()
+            self.rotations += 1
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = self._next_path()
+        self.opened_at = time.time()
+        try:
+            self.open()
+        except BaseException:
+            # Nothing is open, so the next write tries to rotate again
+            self.path = None
+            raise
+
+
+class JsonlWriter(_RotatingFile):
+    suffix = ".jsonl"
+
+    def open(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def size(self):
+        return self._file.tell()
+
+    def write(self, records):
+        if self.due():
+            self.rotate()
+        self._file.write("".join(json.dumps(dict(zip(FIELDS, r)), separators=(",", ":")) + "\n"
+                                 for r in records))
+        self._file.flush()
+
+    def close(self):
+        if self.path is not None:
+            self._file.close()
+
+
+class SqliteWriter(_RotatingFile):
+    suffix = ".sqlite"
+
+    def open(self):
+        import sqlite3
+
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS submissions (time REAL, answers TEXT, prediction INTEGER, "
+                         "model_version TEXT, latency_ms REAL, source TEXT)")
+
+    def size(self):
+        pages, = self._db.execute("PRAGMA page_count").fetchone()
+        page_size, = self._db.execute("PRAGMA page_size").fetchone()
+        return pages * page_size
+
+    def write(self, records):
+        import sqlite3
+
+        try:
+            if self.due():
+                self.rotate()
+            with self._db:
+                self._db.executemany("INSERT INTO submissions VALUES (?, ?, ?, ?, ?, ?)",
+                                     ((t, json.dumps(a), p, v, ms, s) for t, a, p, v, ms, s in records))
+        except sqlite3.Error as exc:
+            raise OSError(f"SQLite write to {self.path} failed: {exc}") from exc
+
+    def close(self):
+        if self.path is not None:
+            self._db.close()
+
+
+WRITERS = {"jsonl": JsonlWriter, "sqlite": SqliteWriter}
+
+
+class SubmissionLog:
+    """Buffers records in memory and writes them in batches from a daemon thread"""
+
+    def __init__(self, writer, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS, max_pending=MAX_PENDING):
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self._buffer = []
+        self._lock = threading.Lock()
+        # Held while writing, so a flush at exit cannot interleave with the thread's
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+        self.logged = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error = None
+
+    def log(self, record):
+        """Queue a record (a tuple in FIELDS order); returns False if it was dropped"""
+        with self._lock:
+            if self._closed or len(self._buffer) >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._buffer.append(record)
+            self.logged += 1
+            pending = len(self._buffer)
+        if self._thread is None:
+            self._start()
+        if pending >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="submission-log", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write everything buffered so far; returns how many records were written"""
+        with self._write_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            try:
+                with timer("submission_log_flush"):
+                    self.writer.write(batch)
+            except Exception as exc:
+                # The batch is lost; keeping it would only grow the buffer while the disk is failing.
+                # Any error is caught so the writer thread keeps running
+                self.errors += 1
+                self.last_error = str(exc)
+                return 0
+            self.written += len(batch)
+            self.batches += 1
+            return len(batch)
+
+    def close(self):
+        """Stop accepting records, write what is buffered and close the file"""
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        self.flush()
+        with self._write_lock:
+            self.writer.close()
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._buffer)
+        return {
+            "format": type(self.writer).__name__,
+            "path": self.writer.path,
+            "pending": pending,
+            "logged": self.logged,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "rotations": self.writer.rotations,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+
+def create_log(log_format=LOG_FORMAT, directory=LOG_DIR, **options):
+    if log_format not in WRITERS:
+        raise ValueError(f"Unknown submission log format {log_format!r}, expected one of {sorted(WRITERS)}")
+    return SubmissionLog(WRITERS[log_format](directory), **options)
+
+
+def log_submission(answers, prediction, model_version, latency_seconds, source=None):
+    """Record one scored submission without waiting for it to be written"""
+    if shared_log is not None:
+        shared_log.log((time.time(), [int(a) for a in answers], int(prediction), model_version,
+                        latency_seconds * 1000, source))
+
+
+def submission_log_stats():
+    return shared_log.stats() if shared_log is not None else {}
+
+
+shared_log = None if LOG_FORMAT == "off" else create_log()
+if shared_log is not None:
+    atexit.register(shared_log.close)
+register_gauges("career_submission_log", submission_log_stats, "Submission log statistics.")
+
+
+def bench(args):
+    directory = tempfile.mkdtemp(prefix="submission-log-")
+    try:
+        log = create_log(args.format, directory)
+        record = (time.time(), [3, 2, 1, 0, 5, 4, 3, 2, 1, 0, 1, 2, 3, 4, 5], 7, "bench", 1.5, "model")
+        slowest = 0.0
+        interval = 1 / args.rate if args.rate else 0
+        start = time.perf_counter()
+        for index in range(args.records):
+            delay = start + index * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            call = time.perf_counter()
+            log.log(record)
+            slowest = max(slowest, time.perf_counter() - call)
+        queued = time.perf_counter() - start
+        log.close()
+        total = time.perf_counter() - start
+        print(f"{args.format}: {args.records} records queued at {args.records / queued:,.0f}/s "
+              f"(slowest call {slowest * 1e6:.0f} us), all written at {log.written / total:,.0f}/s; "
+              f"{log.dropped} dropped")
+    finally:
+        shutil.rmtree(directory)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the submission log")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench_parser = sub.add_parser("bench")
+    bench_parser.add_argument("--format", default="jsonl", choices=sorted(WRITERS))
+    bench_parser.add_argument("--records", type=int, default=100000)
+    bench_parser.add_argument("--rate", type=float, default=0, help="records per second (0 = as fast as possible)")
+    return bench(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,280 @@
+"""Retrain the stacked career prediction ensemble from CleanedData.csv.
+
+The pipeline tunes each base estimator on its own grid, cross-validates the
+assembled stack, fits it on every row and writes a versioned artifact with a
+metrics file next to it:
+
+    models/EnsembleModel-<version>.sav
+    models/EnsembleModel-<version>.json
+
+Every (estimator, parameters, fold) fit runs through one joblib pool across all
+cores and is cached on disk, so re-running with the same data and grids only
+fits what changed. The model is trained on the input the page sends it (see
+``assessment.model_inputs``), not on the CSV's own column order and scale.
+``--promote`` also replaces EnsembleModel.sav and rebuilds the NumPy and
+memory-mapped exports and the fast model that the app serves; ``--publish``
+adds the model to the registry instead, where running servers pick it up (see
+model_registry.py).
+
+    python train.py                  # search, cross-validate, fit, write models/
+    python train.py --promote        # ... and make it the served model
+    python train.py --publish        # ... and hot-swap it into running servers
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import warnings
+
+import numpy as np
+
+import dataset
+from assessment import model_inputs, question_columns
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.join(BASE_DIR, "models")
+CACHE_DIR = os.path.join(BASE_DIR, ".train_cache")
+RANDOM_STATE = 42
+
+# Grids searched for each base estimator. The SVC is tuned without Platt
+# scaling, which does not change its decisions but costs a 5-fold refit.
+SEARCH_SPACE = {
+    "DT": {"max_depth": [None, 8, 12, 16], "min_samples_leaf": [1, 2, 4]},
+    "Nb": {"var_smoothing": [1e-9, 1e-6, 1e-3]},
+    "svm": {"C": [0.5, 1.0, 2.0], "gamma": ["scale", 0.05]},
+}
+
+
+def base_estimators(params=None):
+    """The ensemble's base estimators with their defaults as shipped in EnsembleModel.sav"""
+    from sklearn.naive_bayes import GaussianNB
+    from sklearn.svm import SVC
+    from sklearn.tree import DecisionTreeClassifier
+
+    params = params or {}
+    estimators = {
+        "DT": DecisionTreeClassifier(random_state=RANDOM_STATE),
+        "Nb": GaussianNB(),
+        "svm": SVC(max_iter=500, probability=True, random_state=RANDOM_STATE),
+    }
+    for name, estimator in estimators.items():
+        estimator.set_params(**params.get(name, {}))
+    return estimators
+
+
+def build_ensemble(params=None, n_jobs=None):
+    from sklearn.ensemble import StackingClassifier
+    from sklearn.linear_model import LogisticRegression
+
+    return StackingClassifier(estimators=list(base_estimators(params).items()), final_estimator=LogisticRegression(),
+                              stack_method="predict_proba", n_jobs=n_jobs)
+
+
+def _fit_fold(estimator, X, y, train, test):
+    """Fit on one fold and score it; cached on disk by joblib.Memory"""
+    from sklearn.base import clone
+
+    with warnings.catch_warnings():
+        # The SVC's max_iter cap is deliberate; its ConvergenceWarning is noise here
+        warnings.simplefilter("ignore")
+        start = time.perf_counter()
+        model = clone(estimator).fit(X[train], y[train])
+        fit_seconds = time.perf_counter() - start
+        accuracy = float(np.mean(model.predict(X[test]) == y[test]))
+    return {"accuracy": accuracy, "fit_seconds": fit_seconds}
+
+
+def _folds(y, n_folds):
+    from sklearn.model_selection import StratifiedKFold
+
+    splitter = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=RANDOM_STATE)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+
+def _run_fits(jobs, X, y, memory, n_jobs):
+    from joblib import Parallel, delayed
+
+    fit_fold = memory.cache(_fit_fold)
+    return Parallel(n_jobs=n_jobs)(delayed(fit_fold)(estimator, X, y, train, test)
+                                   for estimator, train, test in jobs)
+
+
+def search(X, y, folds, memory, n_jobs, space=SEARCH_SPACE):
+    """Grid-search every base estimator, all fits in one parallel batch"""
+    from sklearn.model_selection import ParameterGrid
+
+    candidates = []
+    for name, grid in space.items():
+        for params in ParameterGrid(grid):
+            estimator = base_estimators({name: params})[name]
+            if name == "svm":
+                estimator.set_params(probability=False)
+            candidates.append((name, params, estimator))
+    jobs = [(estimator, train, test) for _, _, estimator in candidates for train, test in folds]
+    scores = _run_fits(jobs, X, y, memory, n_jobs)
+
+    results = {name: [] for name in space}
+    for index, (name, params, _) in enumerate(candidates):
+        fold_scores = [s["accuracy"] for s in scores[index * len(folds):(index + 1) * len(folds)]]
+        results[name].append({"params": params, "mean_accuracy": float(np.mean(fold_scores)),
+                              "std_accuracy": float(np.std(fold_scores))})
+    # Ties go to the first (simplest) candidate in grid order
+    best = {name: max(rows, key=lambda r: r["mean_accuracy"])["params"] for name, rows in results.items()}
+    return best, results
+
+
+def cross_validate(ensemble, X, y, folds, memory, n_jobs):
+    scores = _run_fits([(ensemble, train, test) for train, test in folds], X, y, memory, n_jobs)
+    accuracies = [s["accuracy"] for s in scores]
+    return {
+        "folds": len(folds),
+        "accuracy_mean": float(np.mean(accuracies)),
+        "accuracy_std": float(np.std(accuracies)),
+        "fold_accuracies": accuracies,
+        "fold_fit_seconds": [s["fit_seconds"] for s in scores],
+    }
+
+
+def _times_ms(func, repeats):
+    """Wall-clock times of ``repeats`` calls of func after one warm-up call, in milliseconds"""
+    func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def inference_latency(model, X, repeats=200):
+    rows = iter(np.resize(np.arange(len(X)), repeats + 1))
+    single = _times_ms(lambda: model.predict(X[next(rows)][np.newaxis, :]), repeats)
+    batch = X[:1024]
+    batched = _times_ms(lambda: model.predict(batch), 5)
+    return {
+        "single_row_median_ms": statistics.median(single),
+        "single_row_p95_ms": statistics.quantiles(single, n=20)[-1],
+        "batch_rows": len(batch),
+        "batch_per_row_ms": statistics.median(batched) / len(batch),
+    }
+
+
+def _version(data_sha256):
+    return time.strftime("%Y%m%d-%H%M%S", time.gmtime()) + "-" + data_sha256[:8]
+
+
+def promote(model_path):
+    """Make a trained artifact the served model and rebuild its exports and the fast model"""
+    import shutil
+
+    import distill
+    import mmap_model
+    import numpy_model
+    from model_provider import MODEL_PATH, NUMPY_MODEL_PATH
+
+    staging = f"{MODEL_PATH}.tmp{os.getpid()}"
+    shutil.copyfile(model_path, staging)
+    os.replace(staging, MODEL_PATH)
+    model = mmap_model.build(MODEL_PATH)
+    numpy_model.save(numpy_model.export_ensemble(model), NUMPY_MODEL_PATH)
+    # The fast model stands in for this one, so it is distilled from it again
+    distill.rebuild_fast_model(model)
+    return model
+
+
+def train(args):
+    import joblib
+    import sklearn
+    from joblib import Memory
+
+    started = time.perf_counter()
+    data = dataset.load(args.data)
+    X = model_inputs(data.features).astype(np.float64)
+    y = np.asarray(data.labels, dtype=np.int64)
+    folds = _folds(y, args.folds)
+    memory = Memory(None if args.no_cache else args.cache_dir, verbose=0)
+    n_jobs = args.jobs
+
+    timings = {}
+    start = time.perf_counter()
+    if args.no_search:
+        best, search_results = {}, {}
+    else:
+        best, search_results = search(X, y, folds, memory, n_jobs)
+    timings["search_seconds"] = time.perf_counter() - start
+    print(f"Best parameters: {json.dumps(best)}")
+
+    start = time.perf_counter()
+    cv = cross_validate(build_ensemble(best, n_jobs=1), X, y, folds, memory, n_jobs)
+    timings["cross_validation_seconds"] = time.perf_counter() - start
+    print(f"Cross-validated accuracy {cv['accuracy_mean']:.4f} +/- {cv['accuracy_std']:.4f}")
+
+    start = time.perf_counter()
+    ensemble = build_ensemble(best, n_jobs=n_jobs)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        ensemble.fit(X, y)
+    timings["final_fit_seconds"] = time.perf_counter() - start
+    timings["total_seconds"] = time.perf_counter() - started
+
+    data_sha256 = data.header["source_sha256"] or hashlib.sha256(np.ascontiguousarray(data.data)).hexdigest()
+    version = args.version or _version(data_sha256)
+    os.makedirs(args.out_dir, exist_ok=True)
+    model_path = os.path.join(args.out_dir, f"EnsembleModel-{version}.sav")
+    joblib.dump(ensemble, model_path)
+    metrics = {
+        "version": version,
+        "artifact": os.path.relpath(model_path, BASE_DIR),
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "data_sha256": data_sha256,
+        "rows": len(y),
+        "features": question_columns,
+        "encoding": "assessment.model_inputs",
+        "random_state": RANDOM_STATE,
+        "best_params": best,
+        "search": search_results,
+        "cross_validation": cv,
+        "training_accuracy": float(np.mean(ensemble.predict(X) == y)),
+        "inference": inference_latency(ensemble, X),
+        "timings": timings,
+        "cpus": os.cpu_count(),
+        "n_jobs": n_jobs,
+        "python": platform.python_version(),
+        "sklearn": sklearn.__version__,
+    }
+    with open(os.path.join(args.out_dir, f"EnsembleModel-{version}.json"), "w") as f:
+        json.dump(metrics, f, indent=2)
+    print(f"Wrote {model_path} in {timings['total_seconds']:.0f}s "
+          f"({metrics['inference']['single_row_median_ms']:.2f} ms per single-row prediction)")
+
+    if args.promote:
+        promote(model_path)
+        print("Promoted to EnsembleModel.sav and rebuilt the NumPy and memory-mapped exports and FastModel.sav")
+    if args.publish:
+        import model_registry
+        model_registry.publish(model_path, version)
+        print(f"Published {version} to {model_registry.REGISTRY_DIR} and made it active")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Retrain the career prediction ensemble")
+    parser.add_argument("--data", default=dataset.DATASET_PATH, help="binary dataset built by dataset.py")
+    parser.add_argument("--out-dir", default=MODELS_DIR)
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="where fold results are cached")
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fits (-1 = every core)")
+    parser.add_argument("--no-search", action="store_true", help="keep the shipped hyperparameters")
+    parser.add_argument("--version", help="artifact version (default <UTC timestamp>-<data hash>)")
+    parser.add_argument("--promote", action="store_true", help="replace EnsembleModel.sav with the new model")
+    parser.add_argument("--publish", action="store_true", help="publish the new model to the model registry")
+    return train(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
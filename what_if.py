@@ -0,0 +1,84 @@
+"""Which single answer change would change the predicted role.
+
+Every answer is moved one level up and one level down, within the range the
+questionnaire produces. The original vector and all the candidates (at most
+31 rows) are scored in one batched ``predict_proba`` call, and the result is
+memoized per answer vector so reruns and repeat patterns cost nothing.
+"""
+import os
+
+import numpy as np
+
+from assessment import MAX_LEVEL
+from instrumentation import register_gauges
+from prediction_cache import PredictionCache, answers_key
+from ranking import top_k
+
+WHAT_IF_CACHE_SIZE = int(os.environ.get("CAREER_WHAT_IF_CACHE_SIZE", "1024"))
+STEPS = (1, -1)
+
+
+def candidate_vectors(answers, steps=STEPS, high=MAX_LEVEL):
+    """Copies of answers with one answer moved by each step, skipping out-of-range values.
+
+    Returns (vectors, question indices, deltas), one entry per candidate.
+    """
+    base = np.asarray(answers, dtype=np.int64)
+    question = np.tile(np.arange(len(base)), len(steps))
+    delta = np.repeat(np.asarray(steps, dtype=np.int64), len(base))
+    value = base[question] + delta
+    valid = (value >= 0) & (value <= high)
+    question, delta, value = question[valid], delta[valid], value[valid]
+    vectors = np.repeat(base[np.newaxis, :], len(value), axis=0)
+    vectors[np.arange(len(value)), question] = value
+    return vectors, question, delta
+
+
+def analyse(model, answers):
+    """Score every one-level change to answers in one batch.
+
+    Returns a dict with the current prediction and its probability, and
+    ``changes``: one dict per candidate with the question index, the delta,
+    the new answer value, the prediction it gets and that prediction's
+    probability, and the probability of the current role after the change.
+    """
+    vectors, question, delta = candidate_vectors(answers)
+    batch = np.vstack([np.asarray(answers, dtype=np.int64)[np.newaxis, :], vectors]).astype(np.float64)
+    proba = model.predict_proba(batch)
+    labels, best = top_k(proba, model.classes_, 1)
+    current = int(labels[0, 0])
+    current_column = int(np.flatnonzero(np.asarray(model.classes_) == current)[0])
+    changes = tuple(
+        {
+            "question": int(q),
+            "delta": int(d),
+            "value": int(v[q]),
+            "prediction": int(label),
+            "probability": float(p),
+            "current_probability": float(c),
+        }
+        for q, d, v, label, p, c in zip(question, delta, vectors, labels[1:, 0], best[1:, 0],
+                                        proba[1:, current_column])
+    )
+    return {"prediction": current, "probability": float(proba[0, current_column]), "changes": changes}
+
+
+def role_changes(result):
+    """The changes that lead to a different role, most confident first"""
+    changes = [c for c in result["changes"] if c["prediction"] != result["prediction"]]
+    return sorted(changes, key=lambda c: c["probability"], reverse=True)
+
+
+def what_if(model, answers, cache=None, version=None):
+    """Memoized ``analyse`` keyed on the answer vector and the model ``version``"""
+    cache = shared_what_if_cache if cache is None else cache
+    key = answers_key(answers, version)
+    result = cache.get(key)
+    if result is None:
+        result = analyse(model, answers)
+        cache.put(key, result)
+    return result
+
+
+shared_what_if_cache = PredictionCache(WHAT_IF_CACHE_SIZE)
+register_gauges("career_what_if_cache", shared_what_if_cache.stats, "What-if analysis cache statistics.")